@@ -0,0 +1,464 @@
+import asyncio
+import math
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+
+# Adzuna search endpoint, formatted with country and page number
+ADZUNA_SEARCH_URL = "https://api.adzuna.com/v1/api/jobs/{country}/search/{page}"
+
+# Adzuna max per page is 50
+MAX_RESULTS_PER_PAGE = 50
+
+# Responses worth retrying: rate limited or a transient server error
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def plan_pages(max_results, results_per_page=MAX_RESULTS_PER_PAGE):
+    """
+    Compute the page plan for a search up front.
+    Returns (results_per_page, [page numbers]) so every page uses the same page size
+    """
+    if max_results <= 0:
+        return results_per_page, []
+
+    # Use one page size for every page so page offsets line up. Small searches still ask
+    # for full pages and trim them, so every search for a query shares the cached pages
+    per_page = min(results_per_page, MAX_RESULTS_PER_PAGE)
+    n_pages = math.ceil(max_results / per_page)
+    return per_page, list(range(1, n_pages + 1))
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by every request path.
+    Tokens refill at rate_per_minute and up to burst requests can go out back to back
+    """
+
+    def __init__(self, rate_per_minute=25, burst=10):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def _try_acquire(self):
+        """
+        Take a token if one is free. Returns 0 on success, otherwise the seconds to wait
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """
+        Block until a request may be sent
+        """
+        while True:
+            wait = self._try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """
+        Wait on the event loop, without tying up a thread, until a request may be sent
+        """
+        while True:
+            wait = self._try_acquire()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds):
+        """
+        Hold back every caller for the given number of seconds, e.g. after a 429
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._blocked_until = max(self._blocked_until, now + seconds)
+            # The server says we are over quota, so start refilling from empty
+            self._tokens = 0.0
+            self._updated = now
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header given either as seconds or an HTTP date
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def create_session(pool_size=10):
+    """
+    Create a requests session with a keep-alive connection pool that accepts gzip responses
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    })
+    return session
+
+
+class AdzunaClient:
+    def __init__(self, app_id, app_key, base_url=ADZUNA_SEARCH_URL, max_workers=4, timeout=10,
+                 pool_size=None, cache=None, rate_limiter=None, max_retries=4,
+                 backoff_base=1.0, backoff_max=60.0):
+        self.app_id = app_id
+        self.app_key = app_key
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.timeout = timeout
+        # Optional ResponseCache holding raw result pages
+        self.cache = cache
+        # Optional RateLimiter, shared with any other client hitting the same quota
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        # One pooled session is shared by every request made through this client
+        self.session = create_session(pool_size or max_workers)
+
+    def close(self):
+        """
+        Close the pooled connections held by the session
+        """
+        self.session.close()
+
+    def fetch_page(self, country, page, what="", results_per_page=MAX_RESULTS_PER_PAGE):
+        """
+        Fetch a single page of search results and return its list of jobs
+        """
+        key, results = self._cached_page(country, page, what, results_per_page)
+        if results is not None:
+            return results
+
+        url, params = self._page_request(country, page, what, results_per_page)
+        response = self._get_with_retry(url, params)
+        return self._store_page(key, response)
+
+    def _cached_page(self, country, page, what, results_per_page):
+        """
+        Return (cache key, cached list of jobs or None)
+        """
+        if self.cache is None:
+            return None, None
+        key = self.cache.make_key(country, page, what, results_per_page)
+        data = self.cache.get(key)
+        if data is None:
+            return key, None
+        return key, data.get('results') or []
+
+    def _page_request(self, country, page, what, results_per_page):
+        """
+        Return the (url, params) for one page of a search
+        """
+        url = self.base_url.format(country=country, page=page)
+        params = {
+            'app_id': self.app_id,
+            'app_key': self.app_key,
+            'results_per_page': results_per_page,
+            'what': what,
+            'content-type': 'application/json'
+        }
+        return url, params
+
+    def _store_page(self, key, response):
+        """
+        Cache a successful response and return its list of jobs
+        """
+        data = response.json()
+        if self.cache is not None:
+            self.cache.put(key, data)
+        return data.get('results') or []
+
+    def _backoff(self, attempt):
+        """
+        Exponential backoff with full jitter for the given retry attempt
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _retry_delay(self, response, attempt):
+        """
+        Seconds to wait before retrying an attempt, or None if it should not be retried.
+        response is None when the request failed to connect or timed out
+        """
+        if attempt == self.max_retries:
+            return None
+        if response is None:
+            return self._backoff(attempt)
+        if response.status_code not in RETRY_STATUS_CODES:
+            return None
+
+        delay = parse_retry_after(response.headers.get('Retry-After'))
+        if delay is None:
+            delay = self._backoff(attempt)
+        return min(delay, self.backoff_max)
+
+    def _hold_back(self, response, delay):
+        """
+        After a 429, make every caller sharing the limiter wait, not just this one.
+        Returns the seconds this caller still has to wait itself
+        """
+        if response is not None and response.status_code == 429 and self.rate_limiter is not None:
+            self.rate_limiter.pause(delay)
+            # The next acquire waits out the pause
+            return 0
+        return delay
+
+    def _get_with_retry(self, url, params):
+        """
+        GET through the rate limiter, retrying 429/5xx responses and connection errors
+        """
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                delay = self._retry_delay(None, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+
+            delay = self._retry_delay(response, attempt)
+            if delay is None:
+                response.raise_for_status()
+                return response
+            time.sleep(self._hold_back(response, delay))
+
+    def iter_pages(self, what="", country="us", max_results=20):
+        """
+        Yield lists of jobs page by page, in page order, while later pages are still
+        being fetched in parallel. A short page marks the end of the result set
+        """
+        per_page, pages = plan_pages(max_results)
+        if not pages:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(pages)))
+        futures = [executor.submit(self.fetch_page, country, page, what, per_page) for page in pages]
+        remaining = max_results
+
+        try:
+            for future in futures:
+                results = future.result()
+                is_last = len(results) < per_page
+
+                # Tag each job with the country it was searched in
+                results = results[:remaining]
+                for job in results:
+                    job['country'] = country
+                remaining -= len(results)
+
+                if results:
+                    yield results
+
+                # A short page means there is nothing after it
+                if is_last or remaining <= 0:
+                    break
+        finally:
+            # Drop pages that are no longer needed, e.g. after a short page or an error
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def search(self, what="", country="us", max_results=20):
+        """
+        Fetch up to max_results jobs, requesting pages in parallel.
+        Pages are merged in page order; a short page marks the end of the result set
+        """
+        all_results = []
+        for results in self.iter_pages(what, country, max_results):
+            all_results.extend(results)
+        return all_results
+
+
+class AsyncAdzunaClient:
+    """
+    Asyncio front end over AdzunaClient for running many searches on one event loop.
+    Requests go through the wrapped client's pooled session and cache in worker threads,
+    with a global cap on how many are in flight at once
+    """
+
+    def __init__(self, client, max_concurrency=8, request_timeout=15):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.request_timeout = request_timeout
+        # Semaphore and the event loop it belongs to; iter_async runs each search on a new loop
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    async def fetch_page(self, country, page, what="", results_per_page=MAX_RESULTS_PER_PAGE):
+        """
+        Fetch a single page, waiting for a concurrency slot.
+        Only the HTTP call itself runs in a worker thread and is limited to request_timeout;
+        waiting for the rate limiter and backing off between retries happen on the event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        client = self.client
+
+        key, results = await asyncio.to_thread(client._cached_page, country, page, what, results_per_page)
+        if results is not None:
+            return results
+        url, params = client._page_request(country, page, what, results_per_page)
+
+        async with self._semaphore:
+            for attempt in range(client.max_retries + 1):
+                if client.rate_limiter is not None:
+                    await client.rate_limiter.acquire_async()
+
+                try:
+                    response = await asyncio.wait_for(
+                        asyncio.to_thread(client.session.get, url, params=params, timeout=client.timeout),
+                        timeout=self.request_timeout
+                    )
+                except (requests.ConnectionError, requests.Timeout, asyncio.TimeoutError):
+                    delay = client._retry_delay(None, attempt)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+                    continue
+
+                delay = client._retry_delay(response, attempt)
+                if delay is None:
+                    response.raise_for_status()
+                    return await asyncio.to_thread(client._store_page, key, response)
+                await asyncio.sleep(client._hold_back(response, delay))
+
+    async def search_many(self, titles, countries, max_results=20, errors=None):
+        """
+        Run every title x country search concurrently.
+        Yields (title, country, page, jobs) as soon as each non-empty page arrives,
+        so callers can start processing before the slowest page is back.
+        A page that fails ends only its own search: its later pages are cancelled and
+        the other searches carry on.
+        Failures are recorded in the errors dict as (title, country) -> exception;
+        without one, the first failure is raised once the other searches have finished
+        """
+        per_page, pages = plan_pages(max_results)
+        if not pages:
+            return
+        raise_errors = errors is None
+        if raise_errors:
+            errors = {}
+
+        tasks = {}
+        for title in titles:
+            for country in countries:
+                for page in pages:
+                    task = asyncio.create_task(self.fetch_page(country, page, title, per_page))
+                    tasks[task] = (title, country, page)
+
+        # Last page worth keeping for each search, lowered when a short page shows up
+        last_page = {(title, country): pages[-1] for title in titles for country in countries}
+        pending = set(tasks)
+
+        def drop_pages_after(search_key, page):
+            last_page[search_key] = page
+            for other in pending:
+                other_title, other_country, other_page = tasks[other]
+                if (other_title, other_country) == search_key and other_page > page:
+                    other.cancel()
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled():
+                        continue
+                    title, country, page = tasks[task]
+                    search_key = (title, country)
+
+                    try:
+                        jobs = task.result()
+                    except Exception as e:
+                        if page <= last_page[search_key]:
+                            errors.setdefault(search_key, e)
+                            drop_pages_after(search_key, page - 1)
+                        continue
+
+                    if page > last_page[search_key]:
+                        continue
+                    is_last = len(jobs) < per_page
+
+                    # A short page means there is nothing after it for this search
+                    if is_last and page < last_page[search_key]:
+                        drop_pages_after(search_key, page)
+
+                    # Trim the final page so each search returns at most max_results
+                    jobs = jobs[:max_results - (page - 1) * per_page]
+                    for job in jobs:
+                        job['country'] = country
+
+                    if jobs:
+                        yield title, country, page, jobs
+        finally:
+            # Stop outstanding requests if the consumer stops early
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if raise_errors and errors:
+            raise next(iter(errors.values()))
+
+    async def search(self, what="", country="us", max_results=20):
+        """
+        Yield (page, jobs) for a single search as pages arrive
+        """
+        async for _, _, page, jobs in self.search_many([what], [country], max_results):
+            yield page, jobs
+
+
+def iter_async(agen):
+    """
+    Drive an async generator from synchronous code (e.g. a Streamlit script),
+    yielding each item as soon as it is produced
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(agen.aclose())
+        loop.close()
@@ -7,7 +7,10 @@ import os
 from datetime import datetime, timedelta
 import streamlit as st
 #from dotenv import load_dotenv
-from data_processor import JobDataProcessor
+from data_processor import JobDataProcessor, apply_job_schema, process_jobs
+from adzuna_client import AdzunaClient, AsyncAdzunaClient, RateLimiter, iter_async
+from response_cache import ResponseCache
+from skill_matcher import SkillMemo
 import random
 
 # Load environment variables
@@ -41,6 +44,9 @@ ADZUNA_COUNTRIES = {
     'za': 'South Africa'
 }
 
+# Requests in flight at once; the connection pool is sized to match so every one keeps its connection
+MAX_CONCURRENT_REQUESTS = 8
+
 # Dynamic color schemes
 COLOR_SCHEMES = [
     ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEEAD'],  # Warm to Cool
@@ -68,77 +74,46 @@ if 'jobs' not in st.session_state:
     st.session_state.search_params = {
         'job_title': '',
         'country': 'us',
+        'countries': ['us'],
         'max_results': 10
     }
 
-def fetch_jobs(job_title="", country="us", max_results=20):
-    """Fetch jobs from Adzuna API with pagination support"""
-    try:
-        all_results = []
-        page = 1
-        
-        while len(all_results) < max_results:
-            # Update base URL with selected country and page number
-            base_url = f"https://api.adzuna.com/v1/api/jobs/{country}/search/{page}"
-            
-            params = {
-                'app_id': ADZUNA_APP_ID,
-                'app_key': ADZUNA_APP_KEY,
-                'results_per_page': min(50, max_results - len(all_results)),  # Adzuna max per page is 50
-                'what': job_title,
-                'content-type': 'application/json'
-            }
-            
-            response = requests.get(base_url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            if 'results' in data and data['results']:
-                all_results.extend(data['results'])
-                page += 1
-                
-                # Check if we've reached the end of available results
-                if len(data['results']) < params['results_per_page']:
-                    break
-            else:
-                break
-        
-        if all_results:
-            # Update color scheme when new search is performed
-            st.session_state.current_color_scheme = get_random_color_scheme()
-            return all_results[:max_results]  # Ensure we don't return more than requested
-        return []
-    except Exception as e:
-        st.error(f"Error fetching jobs: {str(e)}")
-        return []
+@st.cache_resource
+def get_adzuna_client():
+    """Create the Adzuna client once so its connection pool stays warm across reruns"""
+    cache = ResponseCache(cache_dir=".adzuna_cache", ttl=6 * 3600)
+    # Adzuna's default quota is 25 calls per minute
+    rate_limiter = RateLimiter(rate_per_minute=25, burst=10)
+    return AdzunaClient(ADZUNA_APP_ID, ADZUNA_APP_KEY, pool_size=MAX_CONCURRENT_REQUESTS,
+                        cache=cache, rate_limiter=rate_limiter)
 
-def process_jobs(jobs):
-    """Process raw job data into a structured DataFrame"""
-    if not jobs:
-        return pd.DataFrame()
-        
-    processed_jobs = []
-    for job in jobs:
-        processed_job = {
-            'title': job.get('title', ''),
-            'company': job.get('company', {}).get('display_name', ''),
-            'location': job.get('location', {}).get('display_name', ''),
-            'description': job.get('description', ''),
-            'type': job.get('contract_type', ''),
-            'created_at': job.get('created', ''),
-            'url': job.get('redirect_url', ''),
-            'salary_min': job.get('salary_min', 0),
-            'salary_max': job.get('salary_max', 0),
-            'category': job.get('category', {}).get('label', '')
-        }
-        processed_jobs.append(processed_job)
+@st.cache_resource
+def get_skill_memo():
+    """Create the skill memo once, backed by a file so repeat postings skip extraction"""
+    os.makedirs(".adzuna_cache", exist_ok=True)
+    return SkillMemo(path=os.path.join(".adzuna_cache", "skills.sqlite"))
+
+def stream_jobs(job_title="", countries=("us",), max_results=20, errors=None):
+    """
+    Yield (country, page, cleaned DataFrame) as each page of results arrives.
+    Countries whose search fails are recorded in errors as country -> exception
+    """
+    async_client = AsyncAdzunaClient(get_adzuna_client(), max_concurrency=MAX_CONCURRENT_REQUESTS)
+    search_errors = {}
+    pages = iter_async(async_client.search_many([job_title], list(countries), max_results, errors=search_errors))
+    
+    # Flatten, clean and extract skills one page at a time
+    for _, page_country, page, jobs in pages:
+        chunk = JobDataProcessor(process_jobs(jobs), skill_memo=get_skill_memo()).clean_data()
+        yield page_country, page, chunk
     
-    return pd.DataFrame(processed_jobs)
+    if errors is not None:
+        errors.update({failed_country: e for (_, failed_country), e in search_errors.items()})
 
 def create_salary_by_location_plot(df):
     """Create a salary distribution plot by location"""
     # Calculate average salary for each location
-    location_salary = df.groupby('location').agg({
+    location_salary = df.groupby('location', observed=True).agg({
         'salary_min': 'mean',
         'salary_max': 'mean'
     }).reset_index()
@@ -174,36 +149,67 @@ country = st.sidebar.selectbox("Select Country (Optional)", [''] + list(ADZUNA_C
                               format_func=lambda x: ADZUNA_COUNTRIES.get(x, 'All Countries'),
                               index=0 if st.session_state.search_params['country'] == 'us' else 
                               list(ADZUNA_COUNTRIES.keys()).index(st.session_state.search_params['country']))
+multi_country = st.sidebar.checkbox("Search Multiple Countries", len(st.session_state.search_params['countries']) > 1)
+countries = []
+if multi_country:
+    countries = st.sidebar.multiselect("Countries", list(ADZUNA_COUNTRIES.keys()),
+                                       default=st.session_state.search_params['countries'],
+                                       format_func=lambda x: ADZUNA_COUNTRIES[x])
 max_results = st.sidebar.slider("Maximum Results", 5, 500, st.session_state.search_params['max_results'])
 
-def perform_search(job_title, country, max_results):
-    """Perform the job search with given parameters"""
-    with st.spinner("Fetching jobs..."):
-        # Use 'us' as default if no country selected
-        selected_country = country if country else 'us'
-        jobs = fetch_jobs(job_title=job_title, country=selected_country, max_results=max_results)
+# Response cache statistics
+cache_stats = get_adzuna_client().cache.stats()
+st.sidebar.caption(f"Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                   f"{cache_stats['bytes'] / 1024:.0f} KB on disk")
+
+def perform_search(job_title, country, max_results, countries=None):
+    """Perform the job search with given parameters, rendering progress as pages arrive"""
+    # Use 'us' as default if no country selected
+    selected_country = country if country else 'us'
+    selected_countries = list(countries) if countries else [selected_country]
+    selected_country = selected_countries[0]
+    
+    progress = st.empty()
+    chunks = {}
+    errors = {}
+    try:
+        for page_country, page, chunk in stream_jobs(job_title, selected_countries, max_results, errors):
+            chunks[(selected_countries.index(page_country), page)] = chunk
+            progress.info(f"Processed {sum(len(c) for c in chunks.values())} jobs so far...")
+    except Exception as e:
+        st.error(f"Error fetching jobs: {str(e)}")
+    progress.empty()
+    
+    for failed_country, e in errors.items():
+        st.warning(f"Error fetching jobs for {ADZUNA_COUNTRIES.get(failed_country, failed_country)}: {str(e)}")
+    
+    if chunks:
+        # Update color scheme when new search is performed
+        st.session_state.current_color_scheme = get_random_color_scheme()
         
-        if jobs:
-            # Process jobs into DataFrame
-            st.session_state.jobs = process_jobs(jobs)
-            st.session_state.processor = JobDataProcessor(st.session_state.jobs)
-            st.session_state.jobs = st.session_state.processor.clean_data()
-            st.session_state.search_triggered = True
-            st.session_state.search_params = {
-                'job_title': job_title,
-                'country': selected_country,
-                'max_results': max_results
-            }
-        else:
-            st.error("No jobs found. Try adjusting your search criteria.")
-            st.session_state.search_triggered = False
+        # Pages arrive out of order; keep country then page order in the final frame
+        jobs = pd.concat([chunks[key] for key in sorted(chunks)], ignore_index=True)
+        # Chunks with different categories concatenate as object columns, so cast again
+        jobs = apply_job_schema(jobs)
+        st.session_state.processor = JobDataProcessor(jobs)
+        st.session_state.jobs = st.session_state.processor.df
+        st.session_state.search_triggered = True
+        st.session_state.search_params = {
+            'job_title': job_title,
+            'country': selected_country,
+            'countries': selected_countries,
+            'max_results': max_results
+        }
+    else:
+        st.error("No jobs found. Try adjusting your search criteria.")
+        st.session_state.search_triggered = False
 
 # Search button
 if st.sidebar.button("Search Jobs"):
     if not job_title:
         st.error("Please enter a job title to search for")
     else:
-        perform_search(job_title, country, max_results)
+        perform_search(job_title, country, max_results, countries if multi_country else None)
 
 # Only show results if search was triggered
 if st.session_state.search_triggered and not st.session_state.jobs.empty:
@@ -248,8 +254,16 @@ if st.session_state.search_triggered and not st.session_state.jobs.empty:
     except Exception as e:
         st.error("Error applying salary filter")
 
+    # Skill analysis follows the filter; the subset's skill matrix is sliced, not rebuilt
+    filtered_processor = st.session_state.processor.subset(filtered_df.index)
+
     # Main content
-    st.subheader(f"Found {len(filtered_df)} jobs for {job_title} in {ADZUNA_COUNTRIES[st.session_state.search_params['country']]}")
+    country_names = ", ".join(ADZUNA_COUNTRIES[c] for c in st.session_state.search_params['countries'])
+    st.subheader(f"Found {len(filtered_df)} jobs for {job_title} in {country_names}")
+    memory = st.session_state.processor.memory_report()
+    st.caption(f"{len(st.session_state.jobs)} postings using {memory['total'] / 1024 ** 2:.1f} MB in memory · "
+               f"skill matrix built {st.session_state.processor.skill_matrix_builds}x, "
+               f"reused {st.session_state.processor.skill_matrix_reuses}x")
 
     # Create tabs for different views
     tab1, tab2, tab3, tab4 = st.tabs(["Job Listings", "Skills Analysis", "Market Trends", "Company Insights"])
@@ -279,7 +293,7 @@ if st.session_state.search_triggered and not st.session_state.jobs.empty:
         st.subheader("Skills Analysis")
         
         # Top skills visualization
-        top_skills = st.session_state.processor.get_top_skills(10)
+        top_skills = filtered_processor.get_top_skills(10)
         if not top_skills.empty:
             fig = px.bar(
                 x=top_skills.values,
@@ -307,10 +321,8 @@ if st.session_state.search_triggered and not st.session_state.jobs.empty:
         
         with col1:
             # Job posting trends with moving average
-            trends = st.session_state.processor.get_job_trends()
+            trends = st.session_state.processor.get_job_trends(freq='day', window=7)
             if not trends.empty:
-                # Calculate 7-day moving average
-                trends['moving_avg'] = trends['count'].rolling(window=7, min_periods=1).mean()
                 
                 fig = go.Figure()
                 fig.add_trace(go.Scatter(
@@ -392,7 +404,7 @@ if st.session_state.search_triggered and not st.session_state.jobs.empty:
         
         with col1:
             # Top growing skills
-            skills_trend = st.session_state.processor.get_skills_trend()
+            skills_trend = filtered_processor.get_skills_trend()
             if not skills_trend.empty:
                 fig = px.bar(
                     skills_trend.head(10),
@@ -412,7 +424,7 @@ if st.session_state.search_triggered and not st.session_state.jobs.empty:
         
         with col2:
             # Location-based salary comparison
-            location_salary = filtered_df.groupby('location').agg({
+            location_salary = filtered_df.groupby('location', observed=True).agg({
                 'salary_min': 'mean',
                 'salary_max': 'mean'
             }).reset_index()
@@ -0,0 +1,83 @@
+"""
+Time process_jobs against the original dict-per-job loop on synthetic Adzuna results.
+
+    python bench/bench_process_jobs.py [n_jobs]
+"""
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_processor import apply_job_schema, normalize_salaries, process_jobs
+
+
+def make_jobs(n, seed=0):
+    rng = random.Random(seed)
+    return [{
+        'title': f"Developer {i}",
+        'company': {'display_name': f"Company {rng.randrange(500)}"},
+        'location': {'display_name': f"Location {rng.randrange(300)}"},
+        'description': "Looking for a developer with Python, SQL and AWS experience. " * 4,
+        'contract_type': rng.choice(['permanent', 'contract']),
+        'created': f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00Z",
+        'redirect_url': f"https://www.adzuna.com/details/{i}",
+        'salary_min': rng.uniform(20000, 60000),
+        'salary_max': rng.uniform(60000, 120000),
+        'category': {'label': 'IT Jobs'},
+        'country': rng.choice(['gb', 'us', 'de', 'fr'])
+    } for i in range(n)]
+
+
+def dict_loop(jobs):
+    """
+    process_jobs before the columnar rewrite, without the later date parse and schema
+    """
+    processed_jobs = []
+    for job in jobs:
+        processed_jobs.append({
+            'title': job.get('title', ''),
+            'company': job.get('company', {}).get('display_name', ''),
+            'location': job.get('location', {}).get('display_name', ''),
+            'description': job.get('description', ''),
+            'type': job.get('contract_type', ''),
+            'created_at': job.get('created', ''),
+            'url': job.get('redirect_url', ''),
+            'salary_min': job.get('salary_min', 0),
+            'salary_max': job.get('salary_max', 0),
+            'category': job.get('category', {}).get('label', ''),
+            'country': job.get('country', '')
+        })
+    return normalize_salaries(pd.DataFrame(processed_jobs))
+
+
+def dict_loop_typed(jobs):
+    """
+    The dict loop plus the date parse and schema cast that give the same frame as process_jobs
+    """
+    df = dict_loop(jobs)
+    df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
+    return apply_job_schema(df)
+
+
+def best_of(func, jobs, repeat=15):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(jobs)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    jobs = make_jobs(n)
+
+    print(f"{n} jobs, best of 15, speedup over the dict loop + parse + schema")
+    baseline = best_of(dict_loop_typed, jobs)
+    for name, func in [('dict loop', dict_loop), ('dict loop + parse + schema', dict_loop_typed), ('process_jobs', process_jobs)]:
+        seconds = baseline if func is dict_loop_typed else best_of(func, jobs)
+        print(f"{name:28s} {seconds:.3f}s  {baseline / seconds:.2f}x")
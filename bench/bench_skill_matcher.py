@@ -0,0 +1,72 @@
+"""
+Time SkillMatcher.find against the original substring scans on synthetic descriptions.
+
+    python bench/bench_skill_matcher.py [n_descriptions]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_processor import SKILL_TAXONOMY_PATH
+from skill_matcher import SkillMatcher, load_taxonomy
+
+FILLER = (
+    "we are looking for an experienced engineer to join our growing team and help build "
+    "reliable services with modern tools in a friendly remote first environment"
+).split()
+
+
+def substring_scan(skills):
+    """
+    The original extraction: one lowercase substring test per skill
+    """
+    lowered = [skill.lower() for skill in skills]
+
+    def find(description):
+        desc = description.lower()
+        return [skill for skill, pattern in zip(skills, lowered) if pattern in desc]
+    return find
+
+
+def make_descriptions(n, words, skill_share, skills, seed=0):
+    rng = random.Random(seed)
+    return [
+        ' '.join(rng.choice(skills) if rng.random() < skill_share else rng.choice(FILLER) for _ in range(words))
+        for _ in range(n)
+    ]
+
+
+def timed(find, texts):
+    start = time.perf_counter()
+    for text in texts:
+        find(text)
+    return time.perf_counter() - start
+
+
+def run_case(name, taxonomy, texts):
+    skills = [skill for skill, _, _ in taxonomy]
+    matcher = SkillMatcher(taxonomy)
+    old = timed(substring_scan(skills), texts)
+    new = timed(matcher.find, texts)
+    print(f"{name:44s} substring scans {old:6.2f}s   find {new:6.2f}s   {old / new:5.2f}x")
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    taxonomy = load_taxonomy(SKILL_TAXONOMY_PATH)
+    skills = [skill for skill, _, _ in taxonomy]
+    # A large taxonomy: the real skills plus made-up ones that never occur
+    large = taxonomy + tuple((f"Skill{i:04d}", (), False) for i in range(1000))
+
+    print(f"{n} descriptions per case")
+    run_case(f"{len(taxonomy)} skills, 120 words, 2% skills", taxonomy,
+             make_descriptions(n, 120, 0.02, skills))
+    run_case(f"{len(large)} skills, 120 words, 2% skills", large,
+             make_descriptions(n, 120, 0.02, skills))
+    # Skill-dense text: the substring scans stop at an early hit for most skills, while
+    # the automaton still reads every character and yields every one of the hits
+    run_case(f"{len(taxonomy)} skills, 400 words, 20% skills", taxonomy,
+             make_descriptions(n, 400, 0.2, skills))
@@ -0,0 +1,66 @@
+"""
+Time 7-day date range queries on a large frame: a boolean mask over created_at
+against get_jobs_between on an unsorted frame and on a frame kept sorted.
+
+    python bench/bench_time_index.py [n_rows]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_processor import JobDataProcessor
+
+QUERIES = 200
+
+
+def make_jobs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    # A year of postings in random order, as pages from several searches arrive
+    end = pd.Timestamp('2024-12-31', tz='UTC')
+    offsets = rng.integers(0, 365 * 24 * 3600, n)
+    return pd.DataFrame({
+        'title': np.array([f"Job {i}" for i in range(n)], dtype=object),
+        'created_at': end - pd.to_timedelta(offsets, unit='s'),
+        'salary_min': rng.uniform(20000, 80000, n).astype('float32')
+    })
+
+
+def per_query(query, starts):
+    start = time.perf_counter()
+    for value in starts:
+        query(value)
+    return (time.perf_counter() - start) / len(starts)
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    df = make_jobs(n)
+    rng = np.random.default_rng(1)
+    starts = [pd.Timestamp('2024-01-08', tz='UTC') + pd.Timedelta(days=int(day)) for day in rng.integers(0, 350, QUERIES)]
+    week = pd.Timedelta(days=7)
+
+    rows = ((df['created_at'] >= starts[0]) & (df['created_at'] < starts[0] + week)).sum()
+    print(f"{n} rows, 7-day windows of about {rows} rows, mean of {QUERIES} queries")
+
+    mask = per_query(lambda value: df[(df['created_at'] >= value) & (df['created_at'] < value + week)], starts)
+    print(f"{'boolean mask':32s} {mask * 1000:7.2f} ms")
+
+    processor = JobDataProcessor(df.copy())
+    build = time.perf_counter()
+    processor.get_jobs_between(starts[0], starts[0] + week)
+    build = time.perf_counter() - build
+    indexed = per_query(lambda value: processor.get_jobs_between(value, value + week), starts)
+    print(f"{'sorted index, unsorted frame':32s} {indexed * 1000:7.2f} ms  (index built in {build * 1000:.0f} ms)")
+
+    processor = JobDataProcessor(df.copy())
+    sort = time.perf_counter()
+    processor.sort_by_created_at()
+    processor.get_jobs_between(starts[0], starts[0] + week)
+    sort = time.perf_counter() - sort
+    sliced = per_query(lambda value: processor.get_jobs_between(value, value + week), starts)
+    print(f"{'sorted frame, slice':32s} {sliced * 1000:7.2f} ms  (sorted in {sort * 1000:.0f} ms)")
@@ -0,0 +1,105 @@
+import os
+import pickle
+import threading
+
+
+class ClusterModelStore:
+    """
+    Fitted clustering models persisted to disk so new sessions can assign clusters
+    without refitting. Holds one fitted state (scaler, model, skill vocabulary) per
+    engine, reloaded on startup, and refits in a background thread when new postings
+    sit further from the centroids than the training data did by drift_threshold.
+    A refit that fails leaves the saved model in place and its exception in last_error
+    """
+
+    def __init__(self, path=".adzuna_cache/cluster_models.pkl", drift_threshold=1.25):
+        self.path = path
+        self.drift_threshold = drift_threshold
+        self.refits = 0
+        self.last_error = None
+
+        self._lock = threading.Lock()
+        self._models = {}
+        self._refit_thread = None
+        self._load()
+
+    def _load(self):
+        """
+        Read the saved models, starting empty if the file is missing or unreadable
+        """
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                self._models = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            self._models = {}
+
+    def get(self, engine):
+        """
+        Return the saved state for an engine, or None
+        """
+        with self._lock:
+            return self._models.get(engine)
+
+    def put(self, engine, state):
+        """
+        Save the fitted state for an engine
+        """
+        with self._lock:
+            self._models[engine] = state
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            # Write to a temporary file first so a crash never leaves a partial file
+            tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(self._models, f)
+            os.replace(tmp_path, self.path)
+
+    def is_drifting(self, state, mean_distance):
+        """
+        Whether postings with this mean distance to their centroid call for a refit.
+        A model whose training postings all sat on their centroids gives no drift signal
+        """
+        if not state['baseline_distance']:
+            return False
+        return mean_distance > state['baseline_distance'] * self.drift_threshold
+
+    def refitting(self):
+        """
+        Whether a background refit is running
+        """
+        return self._refit_thread is not None and self._refit_thread.is_alive()
+
+    def refit_in_background(self, engine, fit):
+        """
+        Run fit() in a background thread and save the state it returns.
+        Returns False without starting anything if a refit is already running
+        """
+        with self._lock:
+            if self.refitting():
+                return False
+
+            def run():
+                try:
+                    self.put(engine, fit())
+                except Exception as e:
+                    self.last_error = e
+                    return
+                self.refits += 1
+                self.last_error = None
+
+            # Not a daemon, so the interpreter waits for the fit instead of exiting under it
+            self._refit_thread = threading.Thread(target=run)
+            self._refit_thread.start()
+            return True
+
+    def wait(self, timeout=None):
+        """
+        Wait for a running background refit to finish
+        """
+        thread = self._refit_thread
+        if thread is not None:
+            thread.join(timeout)
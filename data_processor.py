@@ -1,13 +1,367 @@
 import pandas as pd
 import numpy as np
+from scipy import sparse
+from scipy.special import erfc
 from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import hashlib
 from datetime import datetime
+import os
 import re
+from skill_matcher import SkillMatcher, SkillMemo
+
+# Skill taxonomy with aliases, loaded once
+SKILL_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills.json')
+
+# Salary currency used by each Adzuna country
+COUNTRY_CURRENCIES = {
+    'us': 'USD', 'gb': 'GBP', 'au': 'AUD', 'br': 'BRL', 'ca': 'CAD',
+    'de': 'EUR', 'fr': 'EUR', 'in': 'INR', 'it': 'EUR', 'mx': 'MXN',
+    'nl': 'EUR', 'nz': 'NZD', 'pl': 'PLN', 'ru': 'RUB', 'sg': 'SGD',
+    'es': 'EUR', 'za': 'ZAR'
+}
+
+# Approximate USD value of one unit of each currency, used to compare salaries across countries
+USD_EXCHANGE_RATES = {
+    'USD': 1.0, 'GBP': 1.27, 'EUR': 1.08, 'AUD': 0.66, 'BRL': 0.20,
+    'CAD': 0.74, 'INR': 0.012, 'MXN': 0.058, 'NZD': 0.61, 'PLN': 0.25,
+    'RUB': 0.011, 'SGD': 0.74, 'ZAR': 0.054
+}
+
+# Job record fields: (column, Adzuna key, nested key or None, default)
+JOB_FIELDS = [
+    ('title', 'title', None, ''),
+    ('company', 'company', 'display_name', ''),
+    ('location', 'location', 'display_name', ''),
+    ('description', 'description', None, ''),
+    ('type', 'contract_type', None, ''),
+    ('created_at', 'created', None, ''),
+    ('url', 'redirect_url', None, ''),
+    ('salary_min', 'salary_min', None, 0),
+    ('salary_max', 'salary_max', None, 0),
+    ('category', 'category', 'label', ''),
+    ('country', 'country', None, '')
+]
+
+# Declared dtypes for job records. Repetitive strings are categoricals,
+# salaries are float32 and calendar fields are nullable ints
+JOB_SCHEMA = {
+    'title': 'object',
+    'company': 'category',
+    'location': 'category',
+    'description': 'object',
+    'type': 'category',
+    'created_at': 'datetime64',
+    'url': 'object',
+    'salary_min': 'float32',
+    'salary_max': 'float32',
+    'category': 'category',
+    'country': 'category',
+    'currency': 'category',
+    'year': 'Int16',
+    'month': 'Int8',
+    'avg_salary': 'float32',
+    'skill_count': 'Int16'
+}
+
+def apply_job_schema(df):
+    """
+    Cast the columns of a jobs DataFrame to the dtypes in JOB_SCHEMA
+    """
+    for column, dtype in JOB_SCHEMA.items():
+        if column not in df.columns:
+            continue
+        if dtype == 'datetime64':
+            if not pd.api.types.is_datetime64_any_dtype(df[column]):
+                df[column] = pd.to_datetime(df[column], errors='coerce')
+        elif dtype.startswith('float'):
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype(dtype)
+        elif dtype != 'object' and df[column].dtype != dtype:
+            df[column] = df[column].astype(dtype)
+    return df
+
+def normalize_salaries(df):
+    """
+    Convert salaries from each country's local currency to USD
+    """
+    if df.empty or 'country' not in df.columns:
+        return df
+    
+    df['currency'] = df['country'].map(COUNTRY_CURRENCIES).fillna('USD')
+    rates = df['currency'].map(USD_EXCHANGE_RATES).fillna(1.0)
+    for column in ['salary_min', 'salary_max']:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce') * rates
+    
+    return df
+
+def parse_created(values):
+    """
+    Parse Adzuna 'created' timestamps such as '2024-01-15T10:30:00Z' to UTC datetimes
+    """
+    # numpy reads plain ISO timestamps several times faster than pd.to_datetime, so use it
+    # when every value has Adzuna's exact format and leave anything else to pandas
+    if all(isinstance(value, str) and len(value) == 20 and value[19] == 'Z' for value in values):
+        try:
+            stamps = np.array([value[:19] for value in values], dtype='datetime64[s]')
+            return pd.DatetimeIndex(stamps.astype('datetime64[ns]')).tz_localize('UTC')
+        except ValueError:
+            pass
+    return pd.to_datetime(values, errors='coerce')
+
+def process_jobs(jobs):
+    """
+    Process raw job data into a structured DataFrame, one column at a time
+    """
+    if not jobs:
+        return pd.DataFrame()
+    
+    # Pull each field straight into a column array instead of building a dict per job.
+    # Object arrays skip pandas' per-column type inference when the frame is built
+    columns = {}
+    for column, key, nested, default in JOB_FIELDS:
+        if nested is None:
+            values = [job.get(key, default) for job in jobs]
+        else:
+            values = [(job.get(key) or {}).get(nested, default) for job in jobs]
+        columns[column] = np.array(values, dtype=object)
+    
+    # Give numeric and date columns their final dtypes at construction
+    columns['salary_min'] = pd.to_numeric(columns['salary_min'], errors='coerce')
+    columns['salary_max'] = pd.to_numeric(columns['salary_max'], errors='coerce')
+    columns['created_at'] = parse_created(columns['created_at'])
+    
+    return apply_job_schema(normalize_salaries(pd.DataFrame(columns)))
+
+def memory_report(df):
+    """
+    Get memory used by each column in bytes, including string contents, plus a total
+    """
+    usage = df.memory_usage(deep=True, index=False)
+    usage['total'] = usage.sum()
+    return usage
+
+def fill_missing(series, value):
+    """
+    fillna that also works for categorical columns
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+def skill_indicator_matrix(skills_lists, vocabulary=None):
+    """
+    Build a sparse uint8 CSR indicator matrix with one row per skills list.
+    Columns are the given vocabulary, or the sorted skills found when it is None;
+    skills outside the vocabulary are ignored. Returns (matrix, column skill names)
+    """
+    skills_lists = list(skills_lists)
+    lengths = np.fromiter((len(skills) for skills in skills_lists), dtype=np.int64, count=len(skills_lists))
+    flat = [skill for skills in skills_lists for skill in skills]
+    rows = np.repeat(np.arange(len(skills_lists)), lengths)
+    
+    if vocabulary is None:
+        # Column codes come from the sorted unique skills
+        if not flat:
+            return sparse.csr_matrix((len(skills_lists), 0), dtype=np.uint8), []
+        vocabulary, cols = np.unique(np.asarray(flat, dtype=object), return_inverse=True)
+        vocabulary = list(vocabulary)
+    else:
+        vocabulary = list(vocabulary)
+        positions = {skill: j for j, skill in enumerate(vocabulary)}
+        cols = np.fromiter((positions.get(skill, -1) for skill in flat), dtype=np.int64, count=len(flat))
+        known = cols >= 0
+        rows, cols = rows[known], cols[known]
+    
+    data = np.ones(len(cols), dtype=np.uint8)
+    matrix = sparse.csr_matrix((data, (rows, cols)), shape=(len(skills_lists), len(vocabulary)))
+    
+    # A skill listed twice for one posting still counts once
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    return matrix, vocabulary
+
+# Named trend frequencies and the pandas periods they bucket postings by
+TREND_FREQUENCIES = {'hour': 'h', 'day': 'D', 'week': 'W-SUN', 'month': 'M'}
+
+class JobTrendSeries:
+    """
+    Posting counts per time bucket ('hour', 'day', 'week' starting Monday, 'month',
+    or a pandas period alias), zero-filled from the first bucket to the last.
+    add() only updates the buckets the new postings fall in
+    """
+    
+    def __init__(self, freq='month'):
+        self.freq = freq
+        self._period = TREND_FREQUENCIES.get(freq, freq)
+        # Counts for consecutive period ordinals starting at self._first
+        self._first = None
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._tz = None
+    
+    def add(self, created_at):
+        """
+        Count postings with the given created_at values
+        """
+        created_at = pd.Series(created_at)
+        if not pd.api.types.is_datetime64_any_dtype(created_at):
+            created_at = pd.to_datetime(created_at, errors='coerce')
+        if created_at.dt.tz is not None:
+            # Bucket by UTC time, labelled in UTC
+            self._tz = 'UTC'
+            created_at = created_at.dt.tz_convert(None)
+        
+        ordinals = created_at.dropna().dt.to_period(self._period).array.asi8
+        if not len(ordinals):
+            return
+        
+        low, high = ordinals.min(), ordinals.max()
+        if self._first is None:
+            self._first = low
+        # Grow the bucket range to cover the new postings
+        if low < self._first:
+            self._counts = np.concatenate([np.zeros(self._first - low, dtype=np.int64), self._counts])
+            self._first = low
+        if high - self._first + 1 > len(self._counts):
+            self._counts = np.concatenate([self._counts,
+                                           np.zeros(high - self._first + 1 - len(self._counts), dtype=np.int64)])
+        
+        offsets = ordinals - low
+        self._counts[low - self._first:high - self._first + 1] += np.bincount(offsets, minlength=high - low + 1)
+    
+    def to_series(self):
+        """
+        Counts as a Series on a sorted DatetimeIndex of bucket start times
+        """
+        if self._first is None:
+            return pd.Series(dtype=np.int64, index=pd.DatetimeIndex([]))
+        
+        start = pd.Period(ordinal=self._first, freq=self._period)
+        index = pd.period_range(start, periods=len(self._counts), freq=self._period).to_timestamp()
+        if self._tz is not None:
+            index = index.tz_localize(self._tz)
+        return pd.Series(self._counts.copy(), index=index)
+
+# Measures analyze_skill_relationships and related_skills can compute from co-occurrence counts
+RELATIONSHIP_METRICS = ('correlation', 'jaccard', 'lift', 'pmi')
+
+def skill_cooccurrence(matrix):
+    """
+    Co-occurrence counts of a sparse skill indicator matrix.
+    Returns (X^T X as a sparse int64 matrix, postings per skill, number of postings)
+    """
+    x = matrix.astype(np.int64)
+    counts = np.asarray(x.sum(axis=0)).ravel()
+    return (x.T @ x).tocsr(), counts, matrix.shape[0]
+
+def relationship_scores(metric, both, count_a, count_b, n):
+    """
+    Score skill pairs from how often they co-occur (both) and occur (count_a, count_b)
+    in n postings. Works elementwise on scalars or arrays
+    """
+    if metric not in RELATIONSHIP_METRICS:
+        raise ValueError(f"Unknown relationship metric: {metric}")
+    both = np.asarray(both, dtype=np.float64)
+    count_a = np.asarray(count_a, dtype=np.float64)
+    count_b = np.asarray(count_b, dtype=np.float64)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if metric == 'correlation':
+            # Pearson correlation of two 0/1 indicators (the phi coefficient)
+            return (n * both - count_a * count_b) / np.sqrt(count_a * (n - count_a) * count_b * (n - count_b))
+        if metric == 'jaccard':
+            return both / (count_a + count_b - both)
+        lift = both * n / (count_a * count_b)
+        if metric == 'lift':
+            return lift
+        return np.log2(lift)
+
+def grouped_quantiles(groups, values, n_groups, quantiles):
+    """
+    Quantiles of values within each group (0..n_groups-1) from one sort, ignoring NaN.
+    Returns one array of n_groups results per quantile, NaN for empty groups
+    """
+    keep = ~np.isnan(values)
+    groups, values = groups[keep], values[keep]
+    # Sort by value, then stably (a radix sort on the integer codes) by group
+    order = np.argsort(values)
+    values = values[order[np.argsort(groups[order], kind='stable')]]
+    sizes = np.bincount(groups, minlength=n_groups)
+    offsets = np.r_[0, np.cumsum(sizes)[:-1]]
+    
+    has_values = sizes > 0
+    results = []
+    for q in quantiles:
+        # Linear interpolation between the closest ranks, as numpy.quantile does
+        position = q * (sizes - 1)
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        result = np.full(n_groups, np.nan)
+        lo_values = values[(offsets + low)[has_values]]
+        hi_values = values[(offsets + high)[has_values]]
+        result[has_values] = lo_values + (hi_values - lo_values) * (position - low)[has_values]
+        results.append(result)
+    return results
+
+def _make_kmeans(engine, n_clusters, batch_size):
+    if engine == 'minibatch':
+        return MiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size, random_state=42, n_init=3)
+    return KMeans(n_clusters=n_clusters, random_state=42)
+
+def _evaluate_k(features, k, engine, batch_size, sample_size):
+    """
+    Fit one clustering and score it by inertia and a sampled silhouette score
+    """
+    model = _make_kmeans(engine, k, batch_size)
+    labels = model.fit_predict(features)
+    silhouette = np.nan
+    if len(np.unique(labels)) > 1:
+        silhouette = silhouette_score(features, labels, sample_size=min(sample_size, features.shape[0]),
+                                      random_state=42)
+    return {'k': k, 'inertia': model.inertia_, 'silhouette': silhouette}
 
 class JobDataProcessor:
-    def __init__(self, df):
+    # Built once from the default taxonomy and shared by every processor
+    _skill_matcher = SkillMatcher.from_file(SKILL_TAXONOMY_PATH)
+    # Extracted skills for descriptions already seen, shared by every processor
+    _skill_memo = SkillMemo()
+    # Cluster-count sweeps by dataset fingerprint, shared so re-renders reuse them
+    _k_sweep_cache = OrderedDict()
+    _k_sweep_cache_size = 32
+    
+    def __init__(self, df, skill_matcher=None, skill_memo=None, model_store=None):
         self.df = df.copy()
+        # Pass a SkillMatcher to extract skills with a different taxonomy
+        if skill_matcher is not None:
+            self._skill_matcher = skill_matcher
+        # Pass a SkillMemo, e.g. one backed by a file, to share results across sessions
+        if skill_memo is not None:
+            self._skill_memo = skill_memo
+        # Pass a ClusterModelStore to reuse fitted clustering models across sessions
+        self._model_store = model_store
+        
+        # Skill matrix cache, rebuilt only when the data or its skills change
+        self._skills_version = 0
+        self._skill_matrix_cache = None
+        self.skill_matrix_builds = 0
+        self.skill_matrix_reuses = 0
+        
+        # Fitted scaler, model and skill vocabulary from the sparse clustering engine
+        self._cluster_state = None
+        # Mean distance to centroids relative to the training data, set when a saved model is used
+        self.cluster_drift = None
+        # (skill matrix, co-occurrence result) for the matrix it was computed from
+        self._cooccurrence_cache = None
+        # freq -> (frame, row count, JobTrendSeries) for the frame the counts were taken from
+        self._trend_cache = {}
+        # (frame, row count, sorted created_at as int64 ns, positions in time order or None if already sorted)
+        self._time_index_cache = None
+        # Set by sort_by_created_at so append_jobs keeps the rows in time order
+        self._time_sorted = False
         
     def clean_data(self):
         """
@@ -22,9 +376,9 @@ class JobDataProcessor:
             self.df['created_at'] = pd.to_datetime(self.df['created_at'])
             
         # Fill missing values
-        self.df['type'] = self.df['type'].fillna('Unknown')
-        self.df['location'] = self.df['location'].fillna('Remote')
-        self.df['company'] = self.df['company'].fillna('Unknown Company')
+        self.df['type'] = fill_missing(self.df['type'], 'Unknown')
+        self.df['location'] = fill_missing(self.df['location'], 'Remote')
+        self.df['company'] = fill_missing(self.df['company'], 'Unknown Company')
         
         # Extract year and month from created_at if it exists
         if 'created_at' in self.df.columns:
@@ -39,168 +393,584 @@ class JobDataProcessor:
             
         # Extract skills from job description
         if 'description' in self.df.columns:
-            self.df['skills'] = self.df['description'].apply(self._extract_skills)
+            self.df['skills'] = self.extract_skills_batch(self.df['description'])
+            self.invalidate_skill_matrix()
             self.df['skill_count'] = self.df['skills'].apply(len)
             
-        return self.df
+        return apply_job_schema(self.df)
     
     def _extract_skills(self, description):
         """
-        Extract skills from job description using common programming languages and technologies
+        Extract skills from job description using the skill taxonomy
         """
         if pd.isna(description):
             return []
             
-        # Common programming languages and technologies
-        skills = [
-            'Python', 'Java', 'JavaScript', 'C++', 'C#', 'Ruby', 'PHP', 'Swift',
-            'Kotlin', 'Go', 'Rust', 'TypeScript', 'SQL', 'NoSQL', 'MongoDB',
-            'PostgreSQL', 'MySQL', 'Oracle', 'AWS', 'Azure', 'GCP', 'Docker',
-            'Kubernetes', 'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask',
-            'Spring', 'Express', 'TensorFlow', 'PyTorch', 'Machine Learning',
-            'Artificial Intelligence', 'Data Science', 'Big Data', 'Hadoop',
-            'Spark', 'Kafka', 'Redis', 'Elasticsearch', 'Git', 'CI/CD', 'DevOps'
-        ]
-        
-        # Convert description to string and lowercase
-        desc = str(description).lower()
-        
-        # Find matching skills
-        found_skills = []
-        for skill in skills:
-            if skill.lower() in desc:
-                found_skills.append(skill)
-                
-        return found_skills
+        # One pass of the compiled matcher finds every skill in the description
+        return self._skill_matcher.find(str(description))
     
-    def create_skill_matrix(self):
+    def extract_skills_batch(self, descriptions, n_jobs=None):
         """
-        Create a matrix of job postings vs skills
+        Extract skills for a whole column of descriptions at once.
+        Large batches are spread across processes; results keep the original order
+        """
+        mask = descriptions.notna().to_numpy()
+        texts = descriptions[mask].astype(str).tolist()
+        
+        # Only run the matcher on descriptions not seen before with this taxonomy
+        version = self._skill_matcher.version
+        keys = [SkillMemo.make_key(version, text) for text in texts]
+        known = self._skill_memo.get_many(keys)
+        
+        new_texts = {}
+        for key, text in zip(keys, texts):
+            if key not in known:
+                new_texts.setdefault(key, text)
+        if new_texts:
+            extracted = self._skill_matcher.find_many(list(new_texts.values()), n_jobs=n_jobs)
+            new_results = dict(zip(new_texts.keys(), extracted))
+            self._skill_memo.put_many(new_results.items(), version)
+            known.update(new_results)
+        
+        found = iter(keys)
+        skills = [list(known[next(found)]) if has_text else [] for has_text in mask]
+        return pd.Series(skills, index=descriptions.index, dtype=object)
+    
+    def _build_skill_matrix(self):
+        """
+        Build a sparse uint8 CSR indicator matrix of job postings vs skills.
+        Rows follow the positions of self.df; returns (matrix, sorted skill names)
         """
         if self.df.empty or 'skills' not in self.df.columns:
-            return pd.DataFrame()
-            
-        # Get unique skills
-        all_skills = set()
-        for skills in self.df['skills']:
-            all_skills.update(skills)
-        all_skills = sorted(list(all_skills))
+            return None, []
         
+        matrix, all_skills = skill_indicator_matrix(self.df['skills'])
         if not all_skills:
+            return None, []
+        return matrix, all_skills
+    
+    def invalidate_skill_matrix(self):
+        """
+        Mark the cached skill matrix as stale, e.g. after editing the skills column in place
+        """
+        self._skills_version += 1
+    
+    def get_skill_matrix(self):
+        """
+        Get the sparse skill matrix and its skill names, building it only when
+        self.df or its skills have changed since the last call
+        """
+        token = (self._skills_version, len(self.df))
+        cache = self._skill_matrix_cache
+        # Hold the frame and index themselves so a replaced frame is never mistaken for the cached one
+        if cache is not None and cache[0] is self.df and cache[1] is self.df.index and cache[2] == token:
+            self.skill_matrix_reuses += 1
+            return cache[3], cache[4]
+        
+        matrix, all_skills = self._build_skill_matrix()
+        self._skill_matrix_cache = (self.df, self.df.index, token, matrix, all_skills)
+        self.skill_matrix_builds += 1
+        return matrix, all_skills
+    
+    def subset(self, index):
+        """
+        Get a processor over the rows of self.df with the given index labels.
+        Its skill matrix is sliced from this processor's instead of being rebuilt
+        """
+        processor = JobDataProcessor(self.df.loc[index], self._skill_matcher, self._skill_memo,
+                                     self._model_store)
+        if not self.df.index.is_unique or 'skills' not in self.df.columns:
+            return processor
+        
+        matrix, all_skills = self.get_skill_matrix()
+        if matrix is None:
+            return processor
+        
+        # Keep only the skills that still occur in the subset
+        positions = self.df.index.get_indexer(processor.df.index)
+        sub_matrix = matrix[positions]
+        present = np.asarray(sub_matrix.sum(axis=0)).ravel() > 0
+        sub_matrix = sub_matrix[:, present]
+        sub_skills = [skill for skill, keep in zip(all_skills, present) if keep]
+        if not sub_skills:
+            sub_matrix = None
+        
+        processor._skill_matrix_cache = (processor.df, processor.df.index,
+                                         (processor._skills_version, len(processor.df)),
+                                         sub_matrix, sub_skills)
+        return processor
+    
+    def create_skill_matrix(self):
+        """
+        Create a matrix of job postings vs skills, stored as sparse uint8 columns
+        """
+        matrix, all_skills = self.get_skill_matrix()
+        if matrix is None:
             return pd.DataFrame()
-            
-        # Create skill matrix
-        skill_matrix = pd.DataFrame(0, index=self.df.index, columns=all_skills)
-        for idx, skills in enumerate(self.df['skills']):
-            for skill in skills:
-                skill_matrix.loc[idx, skill] = 1
-                
-        return skill_matrix
+        return pd.DataFrame.sparse.from_spmatrix(matrix, index=self.df.index, columns=all_skills)
     
-    def cluster_jobs(self, n_clusters=5):
+    def cluster_jobs(self, n_clusters=5, engine='kmeans', batch_size=1024, k_range=range(2, 11), n_jobs=None):
         """
-        Cluster jobs based on skills and features
+        Cluster jobs based on skills and features.
+        engine='kmeans' runs KMeans on the densified, standardized features;
+        engine='minibatch' runs MiniBatchKMeans on the sparse features and keeps
+        the fitted model so partial_fit_clusters can update it with new postings.
+        n_clusters='auto' picks the k in k_range with the best silhouette score.
+        With a model store, a saved model for the engine assigns clusters with predict
+        only, and a refit runs in the background once the postings drift from it
         """
         if self.df.empty:
             return self.df
-            
-        skill_matrix = self.create_skill_matrix()
-        if skill_matrix.empty:
+        if engine not in ('kmeans', 'minibatch'):
+            raise ValueError(f"Unknown clustering engine: {engine}")
+        if 'skills' not in self.df.columns:
             self.df['cluster'] = 0
             return self.df
         
+        store = self._model_store
+        state = store.get(engine) if store is not None else None
+        if state is not None and self._can_reuse_cluster_state(state, n_clusters):
+            self._predict_with_saved_state(engine, state, n_clusters, batch_size, k_range, n_jobs)
+            return self.df
+        
+        labels, state = self._fit_cluster_state(engine, n_clusters, batch_size, k_range, n_jobs)
+        if labels is None:
+            self.df['cluster'] = 0
+            return self.df
+        
+        self.df['cluster'] = labels
+        if engine == 'minibatch':
+            self._cluster_state = state
+        if store is not None:
+            store.put(engine, state)
+        
+        return self.df
+    
+    def _fit_cluster_state(self, engine, n_clusters, batch_size, k_range, n_jobs):
+        """
+        Fit a clustering model on self.df. Returns (labels, state), where state holds
+        the scaler, model and vocabulary plus what is needed to reuse them later
+        """
+        scaled_features, scaler, vocabulary = self._scaled_cluster_features(engine)
+        if scaled_features is None:
+            return None, None
+        
+        if n_clusters == 'auto':
+            sweep = self.sweep_n_clusters(engine, k_range, batch_size, n_jobs=n_jobs)
+            n_clusters = int(sweep['silhouette'].idxmax()) if sweep['silhouette'].notna().any() else 1
+        
+        # Perform clustering
+        model = _make_kmeans(engine, min(n_clusters, len(self.df)), batch_size)
+        labels = model.fit_predict(scaled_features)
+        
+        state = {
+            'scaler': scaler,
+            'model': model,
+            'vocabulary': vocabulary,
+            'taxonomy_version': self._skill_matcher.version,
+            # Typical distance of a training posting to its centroid, the reference for drift
+            'baseline_distance': float(model.transform(scaled_features).min(axis=1).mean())
+        }
+        return labels, state
+    
+    def _can_reuse_cluster_state(self, state, n_clusters):
+        if state.get('taxonomy_version') != self._skill_matcher.version:
+            return False
+        return n_clusters == 'auto' or state['model'].n_clusters == min(n_clusters, len(self.df))
+    
+    def _predict_with_saved_state(self, engine, state, n_clusters, batch_size, k_range, n_jobs):
+        """
+        Label self.df with a saved model and start a background refit if the data has drifted
+        """
+        features = self._sparse_cluster_features(self.df, state['vocabulary'])
+        if engine == 'kmeans':
+            features = features.toarray()
+        distances = state['model'].transform(state['scaler'].transform(features))
+        self.df['cluster'] = distances.argmin(axis=1).astype(np.int32)
+        
+        mean_distance = float(distances.min(axis=1).mean())
+        self.cluster_drift = mean_distance / state['baseline_distance'] if state['baseline_distance'] else None
+        if engine == 'minibatch':
+            # Keep our own copy so partial_fit_clusters does not change the saved model
+            self._cluster_state = copy.deepcopy(state)
+        
+        if self._model_store.is_drifting(state, mean_distance):
+            snapshot = JobDataProcessor(self.df.drop(columns='cluster'), self._skill_matcher, self._skill_memo)
+            self._model_store.refit_in_background(
+                engine, lambda: snapshot._fit_cluster_state(engine, n_clusters, batch_size, k_range, n_jobs)[1]
+            )
+    
+    def _scaled_cluster_features(self, engine):
+        """
+        Scaled clustering features for an engine: dense and standardized for 'kmeans',
+        sparse over the whole taxonomy for 'minibatch'. Returns (features, scaler, vocabulary)
+        """
+        if 'skills' not in self.df.columns:
+            return None, None, None
+        
+        if engine == 'minibatch':
+            # Use the whole taxonomy as the vocabulary so later postings line up with the model
+            vocabulary = list(self._skill_matcher.skills)
+            features = self._sparse_cluster_features(self.df, vocabulary)
+            # Sparse data cannot be centred, so only scale to unit variance
+            scaler = StandardScaler(with_mean=False)
+            return scaler.fit_transform(features), scaler, vocabulary
+        
+        matrix, vocabulary = self.get_skill_matrix()
+        if matrix is None:
+            return None, None, None
+        
         # Add numerical features
-        features = pd.concat([
-            skill_matrix,
-            self.df[['skill_count']]
-        ], axis=1)
+        skill_count = self.df[['skill_count']].to_numpy(dtype=np.float64)
+        features = np.hstack([matrix.toarray(), skill_count])
         
         # Scale features
         scaler = StandardScaler()
-        scaled_features = scaler.fit_transform(features)
+        return scaler.fit_transform(features), scaler, vocabulary
+    
+    def sweep_n_clusters(self, engine='kmeans', k_range=range(2, 11), batch_size=1024, sample_size=2000,
+                         n_jobs=None):
+        """
+        Evaluate several cluster counts in parallel, returning inertia and a sampled
+        silhouette score per k. Results are cached by a fingerprint of the data
+        """
+        matrix, _ = self.get_skill_matrix()
+        if matrix is None:
+            return pd.DataFrame(columns=['inertia', 'silhouette'])
         
-        # Perform clustering
-        kmeans = KMeans(n_clusters=min(n_clusters, len(self.df)), random_state=42)
-        self.df['cluster'] = kmeans.fit_predict(scaled_features)
+        # Fingerprint the skill matrix, skill counts and sweep settings
+        ks = [k for k in k_range if 2 <= k < len(self.df)]
+        fingerprint = hashlib.sha1()
+        for array in (matrix.indptr, matrix.indices, self.df['skill_count'].to_numpy(dtype=np.float64, na_value=0)):
+            fingerprint.update(np.ascontiguousarray(array).tobytes())
+        fingerprint.update(repr((engine, ks, batch_size, sample_size, self._skill_matcher.version)).encode('utf-8'))
+        key = fingerprint.hexdigest()
         
-        return self.df
+        cache = JobDataProcessor._k_sweep_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key].copy()
+        
+        scaled_features, _, _ = self._scaled_cluster_features(engine)
+        n_jobs = min(n_jobs or os.cpu_count() or 1, max(len(ks), 1))
+        if n_jobs == 1:
+            results = [_evaluate_k(scaled_features, k, engine, batch_size, sample_size) for k in ks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                futures = [executor.submit(_evaluate_k, scaled_features, k, engine, batch_size, sample_size)
+                           for k in ks]
+                results = [future.result() for future in futures]
+        
+        sweep = pd.DataFrame(results, columns=['k', 'inertia', 'silhouette']).set_index('k')
+        cache[key] = sweep
+        while len(cache) > JobDataProcessor._k_sweep_cache_size:
+            cache.popitem(last=False)
+        return sweep.copy()
+    
+    def _sparse_cluster_features(self, df, vocabulary):
+        """
+        Sparse features for clustering: skill indicators over a fixed vocabulary plus skill_count
+        """
+        matrix, _ = skill_indicator_matrix(df['skills'], vocabulary)
+        skill_count = df[['skill_count']].to_numpy(dtype=np.float64, na_value=0)
+        return sparse.hstack([matrix.astype(np.float64), sparse.csr_matrix(skill_count)], format='csr')
+    
+    def partial_fit_clusters(self, new_df, n_clusters=5, batch_size=1024):
+        """
+        Update the MiniBatchKMeans model with newly arrived (cleaned) postings and
+        return them with their cluster labels. Starts a model if none is fitted yet
+        """
+        if new_df.empty or 'skills' not in new_df.columns:
+            return new_df
+        
+        state = self._cluster_state
+        if state is None:
+            # The first batch fixes the number of clusters, so it must hold at least that many rows
+            state = {
+                'scaler': StandardScaler(with_mean=False),
+                'model': MiniBatchKMeans(n_clusters=min(n_clusters, len(new_df)), batch_size=batch_size,
+                                         random_state=42, n_init=3),
+                'vocabulary': list(self._skill_matcher.skills)
+            }
+            self._cluster_state = state
+        
+        features = self._sparse_cluster_features(new_df, state['vocabulary'])
+        state['scaler'].partial_fit(features)
+        scaled_features = state['scaler'].transform(features)
+        state['model'].partial_fit(scaled_features)
+        
+        new_df = new_df.copy()
+        new_df['cluster'] = state['model'].predict(scaled_features)
+        return new_df
     
-    def analyze_skill_relationships(self):
+    def get_cooccurrence(self):
         """
-        Analyze relationships between skills
+        Sparse co-occurrence counts for the skill matrix, computed once per matrix.
+        Returns (counts matrix, postings per skill, number of postings, skill names)
         """
-        skill_matrix = self.create_skill_matrix()
-        if skill_matrix.empty:
+        matrix, all_skills = self.get_skill_matrix()
+        if matrix is None:
+            return None, None, 0, []
+        
+        cache = self._cooccurrence_cache
+        if cache is not None and cache[0] is matrix:
+            return cache[1]
+        
+        result = skill_cooccurrence(matrix) + (all_skills,)
+        self._cooccurrence_cache = (matrix, result)
+        return result
+    
+    def analyze_skill_relationships(self, metric='correlation'):
+        """
+        Analyze relationships between skills as a skill x skill DataFrame.
+        metric is 'correlation' (Pearson correlation of the indicators), 'jaccard',
+        'lift' or 'pmi'. Use related_skills for large taxonomies
+        """
+        cooccurrence, counts, n, all_skills = self.get_cooccurrence()
+        if cooccurrence is None:
             return pd.DataFrame()
-        return skill_matrix.corr()
+        
+        scores = relationship_scores(metric, cooccurrence.toarray(), counts[:, None], counts[None, :], n)
+        return pd.DataFrame(scores, index=all_skills, columns=all_skills)
     
-    def get_cluster_summary(self):
+    def related_skills(self, skill=None, k=5, metric='lift', min_cooccurrence=1):
+        """
+        Top-k related skills for every skill (or one skill), scored only over pairs
+        that co-occur at least min_cooccurrence times, so no dense skill x skill
+        matrix is built. Returns a DataFrame of skill, related_skill, cooccurrence and score
+        """
+        columns = ['skill', 'related_skill', 'cooccurrence', metric]
+        cooccurrence, counts, n, all_skills = self.get_cooccurrence()
+        if cooccurrence is None:
+            return pd.DataFrame(columns=columns)
+        
+        if skill is not None:
+            if skill not in all_skills:
+                return pd.DataFrame(columns=columns)
+            row = all_skills.index(skill)
+            pairs = cooccurrence[row].tocoo()
+            rows = np.full(pairs.nnz, row)
+        else:
+            pairs = cooccurrence.tocoo()
+            rows = pairs.row
+        cols, both = pairs.col, pairs.data
+        
+        keep = (rows != cols) & (both >= min_cooccurrence)
+        rows, cols, both = rows[keep], cols[keep], both[keep]
+        scores = relationship_scores(metric, both, counts[rows], counts[cols], n)
+        
+        # Best first within each skill, then keep the first k of each
+        order = np.lexsort((-both, -scores, rows))
+        rows, cols, both, scores = rows[order], cols[order], both[order], scores[order]
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]]) if len(rows) else np.array([], dtype=np.int64)
+        rank = np.arange(len(rows)) - np.repeat(starts, np.diff(np.r_[starts, len(rows)]))
+        top = rank < k
+        
+        names = np.asarray(all_skills, dtype=object)
+        return pd.DataFrame({
+            'skill': names[rows[top]],
+            'related_skill': names[cols[top]],
+            'cooccurrence': both[top],
+            metric: scores[top]
+        }, columns=columns)
+    
+    def get_cluster_summary(self, top_skills=3, quantiles=(0.25, 0.5, 0.75)):
         """
         Get summary statistics for each cluster
+        Salary and skill count statistics, the most common job type, the top_skills
+        most common skills and salary quantiles, all from bincounts over cluster codes
         """
-        if self.df.empty:
+        if self.df.empty or 'cluster' not in self.df.columns:
             return pd.DataFrame()
-            
-        cluster_summary = self.df.groupby('cluster').agg({
-            'avg_salary': ['mean', 'std', 'count'],
-            'skill_count': ['mean', 'std'],
-            'type': lambda x: x.mode()[0] if not x.mode().empty else 'Unknown'
-        }).round(2)
         
-        return cluster_summary
+        # Rows without a cluster are left out, as groupby does
+        codes, clusters = pd.factorize(self.df['cluster'], sort=True)
+        in_cluster = codes >= 0
+        codes = codes[in_cluster]
+        k = len(clusters)
+        summary = {}
+        
+        def add_moments(column, stats):
+            values = self.df[column].to_numpy(dtype=np.float64, na_value=np.nan)[in_cluster]
+            valid = ~np.isnan(values)
+            values = np.where(valid, values, 0.0)
+            count = np.bincount(codes, weights=valid, minlength=k)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean = np.bincount(codes, weights=values, minlength=k) / count
+                # Sum of squares around each cluster's own mean
+                deviations = np.where(valid, values - mean[codes], 0.0)
+                std = np.sqrt(np.bincount(codes, weights=deviations ** 2, minlength=k) / (count - 1))
+            std[count < 2] = np.nan
+            columns = {'mean': mean, 'std': std, 'count': count.astype(np.int64)}
+            for stat in stats:
+                summary[(column, stat)] = columns[stat]
+        
+        if 'avg_salary' in self.df.columns:
+            add_moments('avg_salary', ['mean', 'std', 'count'])
+        if 'skill_count' in self.df.columns:
+            add_moments('skill_count', ['mean', 'std'])
+        
+        if 'type' in self.df.columns:
+            # Most common type per cluster from a cluster x type count table;
+            # ties go to the first type in sort order, as Series.mode does
+            types = self.df['type']
+            if isinstance(types.dtype, pd.CategoricalDtype):
+                type_codes, type_names = types.cat.codes.to_numpy(), types.cat.categories
+            else:
+                type_codes, type_names = pd.factorize(types, sort=True)
+            type_codes = type_codes[in_cluster]
+            known = type_codes >= 0
+            table = np.bincount(codes[known] * len(type_names) + type_codes[known],
+                                minlength=k * len(type_names)).reshape(k, len(type_names))
+            mode = np.asarray(type_names, dtype=object)[table.argmax(axis=1)] if len(type_names) else \
+                np.full(k, 'Unknown', dtype=object)
+            mode[table.sum(axis=1) == 0] = 'Unknown'
+            summary[('type', 'mode')] = mode
+        
+        matrix, all_skills = self.get_skill_matrix() if top_skills and 'skills' in self.df.columns else (None, [])
+        if matrix is not None:
+            rows = np.flatnonzero(in_cluster)
+            assignment = sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (codes, rows)),
+                                           shape=(k, matrix.shape[0]))
+            counts = np.asarray((assignment @ matrix.astype(np.int64)).todense())
+            # Most common first, ties in skill order
+            order = np.argsort(-counts, axis=1, kind='stable')[:, :top_skills]
+            names = np.asarray(all_skills, dtype=object)
+            summary[('skills', 'top')] = [
+                ', '.join(names[j] for j in row if counts[i, j] > 0) for i, row in enumerate(order)
+            ]
+        
+        if quantiles and 'avg_salary' in self.df.columns:
+            salaries = self.df['avg_salary'].to_numpy(dtype=np.float64, na_value=np.nan)[in_cluster]
+            for q, result in zip(quantiles, grouped_quantiles(codes, salaries, k, quantiles)):
+                summary[('avg_salary', f"p{q * 100:g}")] = result
+        
+        cluster_summary = pd.DataFrame(summary, index=pd.Index(clusters, name='cluster'))
+        return cluster_summary.round(2)
     
     def get_top_skills(self, n=10):
         """
         Get the most common skills across all job postings
         """
-        skill_matrix = self.create_skill_matrix()
-        if skill_matrix.empty:
+        matrix, all_skills = self.get_skill_matrix()
+        if matrix is None:
             return pd.Series()
-        skill_counts = skill_matrix.sum().sort_values(ascending=False)
-        return skill_counts.head(n)
+        skill_counts = pd.Series(np.asarray(matrix.sum(axis=0)).ravel(), index=all_skills)
+        return skill_counts.sort_values(ascending=False).head(n)
+        
+    def salary_stats_by_skill(self, quantiles=None):
+        """
+        Salary count, sum, mean and variance for each skill, from one sparse product
+        of the skill matrix with the salaries (missing salaries are left out).
+        quantiles, e.g. (0.25, 0.5, 0.75), adds columns p25, p50 (the median), p75
+        """
+        columns = ['count', 'sum', 'mean', 'var'] + [f"p{q * 100:g}" for q in quantiles or ()]
+        if self.df.empty or 'avg_salary' not in self.df.columns:
+            return pd.DataFrame(columns=columns)
         
+        matrix, all_skills = self.get_skill_matrix()
+        if matrix is None:
+            return pd.DataFrame(columns=columns)
+        
+        salaries = self.df['avg_salary'].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(salaries)
+        # Centre on the overall mean so the sum of squares keeps its precision
+        center = salaries[valid].mean() if valid.any() else 0.0
+        deviations = np.where(valid, salaries - center, 0.0)
+        totals = matrix.T @ np.column_stack([valid.astype(np.float64), deviations, deviations ** 2])
+        count, sum_dev, sum_sq = totals[:, 0], totals[:, 1], totals[:, 2]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stats = pd.DataFrame({
+                'count': count.astype(np.int64),
+                'sum': sum_dev + center * count,
+                'mean': np.where(count > 0, center + sum_dev / count, np.nan),
+                'var': np.where(count > 1, (sum_sq - sum_dev ** 2 / count) / (count - 1), np.nan)
+            }, index=all_skills)
+        
+        if quantiles:
+            # Salaries of each skill's postings, grouped by skill
+            csc = matrix.tocsc()
+            groups = np.repeat(np.arange(len(all_skills)), np.diff(csc.indptr))
+            values = grouped_quantiles(groups, salaries[csc.indices], len(all_skills), quantiles)
+            for column, result in zip(columns[4:], values):
+                stats[column] = result
+        
+        return stats
+    
     def analyze_salary_by_skill(self):
         """
         Analyze average salary for each skill
         """
-        if self.df.empty or 'avg_salary' not in self.df.columns:
+        stats = self.salary_stats_by_skill()
+        if stats.empty:
             return pd.Series()
-            
-        skill_matrix = self.create_skill_matrix()
-        if skill_matrix.empty:
-            return pd.Series()
-            
-        # Calculate average salary for each skill
-        salary_by_skill = {}
-        for skill in skill_matrix.columns:
-            skill_jobs = self.df[skill_matrix[skill] == 1]
-            if not skill_jobs.empty:
-                avg_salary = skill_jobs['avg_salary'].mean()
-                if not pd.isna(avg_salary):
-                    salary_by_skill[skill] = avg_salary
-                    
-        return pd.Series(salary_by_skill).sort_values(ascending=False)
-    
-    def get_job_trends(self):
+        
+        # Skills without any salary data are left out
+        return stats.loc[stats['count'] > 0, 'mean'].sort_values(ascending=False)
+    
+    def _trend_series(self, freq):
+        """
+        The JobTrendSeries for a frequency, counted once per frame and kept up to date by append_jobs
+        """
+        cache = self._trend_cache.get(freq)
+        if cache is not None and cache[0] is self.df and cache[1] == len(self.df):
+            return cache[2]
+        
+        series = JobTrendSeries(freq)
+        series.add(self.df['created_at'])
+        self._trend_cache[freq] = (self.df, len(self.df), series)
+        return series
+    
+    def get_job_trends(self, freq='month', window=None):
         """
         Analyze job posting trends over time
+        Returns date and count of postings per period ('hour', 'day', 'week', 'month'),
+        with periods without postings counted as zero. With window, adds the rolling
+        mean (moving_avg) and standard deviation (moving_std) over that many periods
         """
         if self.df.empty or 'created_at' not in self.df.columns:
             return pd.DataFrame()
-            
-        # Group by month and count jobs
-        trends = self.df.groupby(['year', 'month']).size().reset_index(name='count')
-        trends['date'] = pd.to_datetime(trends[['year', 'month']].assign(day=1))
+        
+        counts = self._trend_series(freq).to_series()
+        if counts.empty:
+            return pd.DataFrame()
+        
+        trends = pd.DataFrame({'date': counts.index, 'count': counts.to_numpy()})
+        if window:
+            rolling = counts.rolling(window, min_periods=1)
+            trends['moving_avg'] = rolling.mean().to_numpy()
+            trends['moving_std'] = rolling.std().to_numpy()
         
         return trends
     
+    def append_jobs(self, new_df):
+        """
+        Append cleaned postings to self.df (rows are renumbered). Trend series already
+        computed are updated with just the new postings; the skill matrix is rebuilt on next use
+        """
+        if new_df.empty:
+            return self.df
+        
+        self.df = apply_job_schema(pd.concat([self.df, new_df], ignore_index=True))
+        if self._time_sorted:
+            self.df = self.df.sort_values('created_at', kind='stable', na_position='first')
+        self.invalidate_skill_matrix()
+        
+        for freq, (_, _, series) in list(self._trend_cache.items()):
+            if 'created_at' in new_df.columns:
+                series.add(new_df['created_at'])
+            self._trend_cache[freq] = (self.df, len(self.df), series)
+        return self.df
+    
     def get_top_companies(self, n=10):
         """
         Get the companies with the most job postings
         """
         if self.df.empty:
             return pd.Series()
-        return self.df['company'].value_counts().head(n)
+        counts = self.df['company'].value_counts()
+        return counts[counts > 0].head(n)
     
     def get_top_locations(self, n=10):
         """
@@ -208,7 +978,8 @@ class JobDataProcessor:
         """
         if self.df.empty:
             return pd.Series()
-        return self.df['location'].value_counts().head(n)
+        counts = self.df['location'].value_counts()
+        return counts[counts > 0].head(n)
     
     def get_job_types_distribution(self):
         """
@@ -216,7 +987,80 @@ class JobDataProcessor:
         """
         if self.df.empty:
             return pd.Series()
-        return self.df['type'].value_counts()
+        counts = self.df['type'].value_counts()
+        return counts[counts > 0]
+    
+    def memory_report(self):
+        """
+        Get memory used by each column of the processed data in bytes
+        """
+        return memory_report(self.df)
+    
+    def sort_by_created_at(self):
+        """
+        Keep self.df sorted by created_at (postings without a date first), so date
+        range queries return slices of self.df instead of copies
+        """
+        if self.df.empty or 'created_at' not in self.df.columns:
+            return self.df
+        
+        df = self.df.sort_values('created_at', kind='stable', na_position='first')
+        # Counts per period do not depend on row order
+        self._trend_cache = {freq: (df, len(df), series) for freq, (_, _, series) in self._trend_cache.items()}
+        self.df = df
+        self._time_sorted = True
+        return self.df
+    
+    def _time_index(self):
+        """
+        created_at as sorted int64 nanoseconds plus the row positions in that order
+        (None when self.df is already sorted), built once per frame
+        """
+        cache = self._time_index_cache
+        if cache is not None and cache[0] is self.df and cache[1] == len(self.df):
+            return cache[2], cache[3]
+        
+        # NaT is the smallest int64, so postings without a date sort first
+        times = self._created_at().to_numpy(dtype='datetime64[ns]').view(np.int64)
+        order = None
+        if not np.all(times[1:] >= times[:-1]):
+            order = np.argsort(times, kind='stable')
+            times = times[order]
+        self._time_index_cache = (self.df, len(self.df), times, order)
+        return times, order
+    
+    def _as_time_value(self, value):
+        """
+        A date as int64 nanoseconds comparable with created_at. Naive dates are taken
+        to be in the column's time zone
+        """
+        value = pd.Timestamp(value)
+        tz = self._created_at().dt.tz
+        if tz is not None and value.tz is None:
+            # A wall time skipped or repeated by a daylight saving change still gives one instant
+            value = value.tz_localize(tz, nonexistent='shift_forward', ambiguous=False)
+        elif tz is None and value.tz is not None:
+            value = value.tz_convert(None)
+        return value.value
+    
+    def get_jobs_between(self, start=None, end=None):
+        """
+        Get jobs posted from start (inclusive) to end (exclusive), in time order.
+        Finds the range with a binary search over the sorted dates; after
+        sort_by_created_at the result is a slice of self.df rather than a copy
+        """
+        if self.df.empty or 'created_at' not in self.df.columns:
+            return pd.DataFrame()
+        
+        times, order = self._time_index()
+        # Postings without a date sit at the front and are never in range
+        low = np.searchsorted(times, self._as_time_value(start) if start is not None else np.iinfo(np.int64).min + 1)
+        high = np.searchsorted(times, self._as_time_value(end)) if end is not None else len(times)
+        high = max(low, high)
+        
+        if order is None:
+            return self.df.iloc[low:high]
+        return self.df.take(order[low:high])
     
     def get_recent_jobs(self, days=7):
         """
@@ -224,64 +1068,120 @@ class JobDataProcessor:
         """
         if self.df.empty or 'created_at' not in self.df.columns:
             return pd.DataFrame()
-            
-        recent_date = pd.Timestamp.now() - pd.Timedelta(days=days)
-        return self.df[self.df['created_at'] >= recent_date]
-
-    def get_skills_trend(self):
+        
+        # Match the time zone of created_at, which is UTC for postings from the API
+        now = pd.Timestamp.now(tz=self._created_at().dt.tz)
+        return self.get_jobs_between(now - pd.Timedelta(days=days))
+    
+    def _created_at(self):
+        """
+        created_at as datetimes, parsed only if the column is not datetime already
+        """
+        created_at = self.df['created_at']
+        if not pd.api.types.is_datetime64_any_dtype(created_at):
+            created_at = pd.to_datetime(created_at, errors='coerce')
+        return created_at
+    
+    def get_skill_counts_by_period(self, periods=2, split='count', freq=None):
+        """
+        Count postings per skill in each time period with one sparse product.
+        Periods are calendar buckets when freq is given (e.g. 'W' or 'M'), otherwise
+        `periods` windows holding equal numbers of postings (split='count') or
+        covering equal spans of time (split='time').
+        Returns (counts DataFrame of period x skill, postings per period Series),
+        both indexed by the start of each period
+        """
+        matrix, all_skills = self.get_skill_matrix()
+        if matrix is None or 'created_at' not in self.df.columns:
+            return pd.DataFrame(), pd.Series(dtype=np.int64)
+        
+        created_at = self._created_at()
+        if created_at.notna().sum() == 0:
+            return pd.DataFrame(columns=all_skills), pd.Series(dtype=np.int64)
+        
+        if freq is not None:
+            if created_at.dt.tz is not None:
+                created_at = created_at.dt.tz_convert(None)
+            buckets = created_at.dt.to_period(freq)
+            period_range = pd.period_range(buckets.min(), buckets.max(), freq=freq)
+            codes = period_range.get_indexer(buckets)
+            labels = period_range.to_timestamp()
+        else:
+            if split not in ('count', 'time'):
+                raise ValueError(f"Unknown period split: {split}")
+            times = created_at.to_numpy(dtype='datetime64[ns]').view(np.int64)
+            valid = created_at.notna().to_numpy()
+            if split == 'count':
+                # Window edges at quantiles of the dates, so each window holds about as many postings
+                edges = created_at.quantile(np.linspace(0, 1, periods + 1))
+                edges = edges.to_numpy(dtype='datetime64[ns]').view(np.int64)
+            else:
+                edges = np.linspace(times[valid].min(), times[valid].max(), periods + 1).astype(np.int64)
+            # A posting on an edge starts the later window; the last window includes its end
+            codes = np.clip(np.searchsorted(edges[1:-1], times, side='right'), 0, periods - 1)
+            codes = np.where(valid, codes, -1)
+            labels = pd.DatetimeIndex(edges[:-1].view('datetime64[ns]'))
+            if created_at.dt.tz is not None:
+                labels = labels.tz_localize('UTC').tz_convert(created_at.dt.tz)
+        
+        # period x posting indicator, so one product counts every skill in every period
+        rows = np.flatnonzero(codes >= 0)
+        assignment = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int64), (codes[rows], rows)),
+            shape=(len(labels), matrix.shape[0])
+        )
+        counts = np.asarray((assignment @ matrix.astype(np.int64)).todense())
+        postings = np.asarray(assignment.sum(axis=1)).ravel()
+        return (pd.DataFrame(counts, index=labels, columns=all_skills),
+                pd.Series(postings, index=labels))
+    
+    def get_skills_trend(self, periods=2, split='count', freq=None, rolling=None, alpha=0.05):
         """
         Calculate growth rate of skills over time
-        Returns a DataFrame with skills and their growth rates
+        Returns a DataFrame with skills and their growth rates.
+        Compares the first and last period from get_skill_counts_by_period (by default
+        the halves before and after the median date); with rolling, the first and last
+        `rolling` periods are summed instead. A two-proportion z-test on each skill's
+        share of postings gives z_score, p_value and whether the change is significant at alpha
         """
         if self.df.empty or 'created_at' not in self.df.columns or 'skills' not in self.df.columns:
             return pd.DataFrame()
-
-        # Convert created_at to datetime if not already
-        self.df['created_at'] = pd.to_datetime(self.df['created_at'])
-        
-        # Get the midpoint date to split data into two periods
-        midpoint = self.df['created_at'].median()
-        
-        # Split data into two periods
-        first_period = self.df[self.df['created_at'] < midpoint]
-        second_period = self.df[self.df['created_at'] >= midpoint]
-        
-        # Calculate skill frequencies for each period
-        first_period_skills = {}
-        second_period_skills = {}
-        
-        # Process first period
-        for skills in first_period['skills']:
-            for skill in skills:
-                first_period_skills[skill] = first_period_skills.get(skill, 0) + 1
-        
-        # Process second period
-        for skills in second_period['skills']:
-            for skill in skills:
-                second_period_skills[skill] = second_period_skills.get(skill, 0) + 1
-        
-        # Calculate growth rates
-        growth_rates = []
-        for skill in set(first_period_skills.keys()) | set(second_period_skills.keys()):
-            first_count = first_period_skills.get(skill, 0)
-            second_count = second_period_skills.get(skill, 0)
+        
+        counts, postings = self.get_skill_counts_by_period(periods, split, freq)
+        if counts.empty:
+            return pd.DataFrame()
+        
+        if rolling:
+            window = min(rolling, len(counts))
+            counts = counts.rolling(window).sum().iloc[window - 1:]
+            postings = postings.rolling(window).sum().iloc[window - 1:]
+        
+        first_count = counts.iloc[0].to_numpy(dtype=np.float64)
+        second_count = counts.iloc[-1].to_numpy(dtype=np.float64)
+        first_total = float(postings.iloc[0])
+        second_total = float(postings.iloc[-1])
+        
+        # Percentage change in postings; a skill that only shows up later counts as 100%
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth_rate = np.where(first_count > 0, (second_count - first_count) / first_count * 100,
+                                   np.where(second_count > 0, 100.0, 0.0))
             
-            # Calculate growth rate (percentage change)
-            if first_count > 0:
-                growth_rate = ((second_count - first_count) / first_count) * 100
-            else:
-                growth_rate = 100 if second_count > 0 else 0
-                
-            growth_rates.append({
-                'skill': skill,
-                'growth_rate': growth_rate,
-                'first_period_count': first_count,
-                'second_period_count': second_count
-            })
-        
-        # Convert to DataFrame and sort by growth rate
-        growth_df = pd.DataFrame(growth_rates)
-        if not growth_df.empty:
-            growth_df = growth_df.sort_values('growth_rate', ascending=False)
-        
-        return growth_df 
\ No newline at end of file
+            # Two-proportion z-test on the share of postings mentioning each skill
+            pooled = (first_count + second_count) / (first_total + second_total)
+            std_err = np.sqrt(pooled * (1 - pooled) * (1 / first_total + 1 / second_total))
+            z_score = (second_count / second_total - first_count / first_total) / std_err
+        p_value = erfc(np.abs(z_score) / np.sqrt(2))
+        
+        growth_df = pd.DataFrame({
+            'skill': counts.columns,
+            'growth_rate': growth_rate,
+            'first_period_count': first_count.astype(np.int64),
+            'second_period_count': second_count.astype(np.int64),
+            'z_score': z_score,
+            'p_value': p_value,
+            'significant': p_value < alpha
+        })
+        
+        # Only skills seen in either period, sorted by growth rate
+        growth_df = growth_df[(growth_df['first_period_count'] > 0) | (growth_df['second_period_count'] > 0)]
+        return growth_df.sort_values('growth_rate', ascending=False).reset_index(drop=True)
@@ -0,0 +1,143 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """
+    On-disk cache of raw API responses, stored as gzip-compressed JSON.
+    Entries expire after ttl seconds and the least recently used entries are
+    evicted once the cache grows past max_bytes
+    """
+
+    def __init__(self, cache_dir=".adzuna_cache", ttl=3600, max_bytes=50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        # filename -> size in bytes, ordered from least to most recently used
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """
+        Rebuild the LRU index from the files already on disk
+        """
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json.gz'):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, name))
+            files.append((stat.st_atime, name, stat.st_size))
+
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def make_key(country, page, what, results_per_page):
+        """
+        Build the cache key for one page of a search
+        """
+        return (country, int(page), what.strip().lower(), int(results_per_page))
+
+    def _filename(self, key):
+        digest = hashlib.sha1(json.dumps(key).encode('utf-8')).hexdigest()
+        return f"{digest}.json.gz"
+
+    def _remove(self, name):
+        size = self._entries.pop(name, 0)
+        self._total_bytes -= size
+        try:
+            os.remove(os.path.join(self.cache_dir, name))
+        except FileNotFoundError:
+            pass
+
+    def get(self, key):
+        """
+        Return the cached response for key, or None if missing or expired
+        """
+        name = self._filename(key)
+        path = os.path.join(self.cache_dir, name)
+
+        with self._lock:
+            if name not in self._entries:
+                self.misses += 1
+                return None
+
+            # Entries are written once, so the modification time is the store time
+            try:
+                mtime = os.path.getmtime(path)
+            except FileNotFoundError:
+                self._remove(name)
+                self.misses += 1
+                return None
+
+            if self.ttl is not None and time.time() - mtime > self.ttl:
+                self._remove(name)
+                self.misses += 1
+                return None
+
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+
+            # Record the access so the LRU order survives restarts
+            os.utime(path, (time.time(), mtime))
+            self._entries.move_to_end(name)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        """
+        Store a response for key, evicting least recently used entries if needed
+        """
+        name = self._filename(key)
+        path = os.path.join(self.cache_dir, name)
+        payload = gzip.compress(json.dumps(data).encode('utf-8'))
+
+        with self._lock:
+            if name in self._entries:
+                self._remove(name)
+
+            # Write to a temporary file first so readers never see a partial entry
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+
+            self._entries[name] = len(payload)
+            self._total_bytes += len(payload)
+
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def clear(self):
+        """
+        Remove every cached entry
+        """
+        with self._lock:
+            for name in list(self._entries):
+                self._remove(name)
+
+    def stats(self):
+        """
+        Return hit/miss counts and the current size of the cache
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes
+            }
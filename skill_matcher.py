@@ -0,0 +1,304 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import ahocorasick
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+# Below this many texts a process pool costs more to start than it saves
+PARALLEL_MIN_TEXTS = 20000
+
+# Bump when the matching rules change, so memoized results from older rules are not reused
+MATCHER_REVISION = 2
+
+# Matcher built once in each worker process by _init_worker
+_worker_matcher = None
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+def _on_boundaries(text, start, end, n, word_start, word_end):
+    """
+    Whether text[start:end + 1] stands on its own. Like \\b, an edge only needs a
+    boundary when the match has a word character there (word_start / word_end),
+    so "c++" counts in "c++11"
+    """
+    if word_start and start > 0 and _is_word_char(text[start - 1]):
+        return False
+    if word_end and end + 1 < n and _is_word_char(text[end + 1]):
+        return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def load_taxonomy(path):
+    """
+    Load a skill taxonomy file once.
+    Returns a tuple of (name, aliases, case_sensitive) entries in file order
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    return tuple(
+        (entry['name'], tuple(entry.get('aliases', ())), bool(entry.get('case_sensitive', False)))
+        for entry in data['skills']
+    )
+
+
+class SkillMatcher:
+    """
+    Multi-pattern matcher that finds every skill in a text in one pass.
+    Skill names and aliases are compiled once into an Aho-Corasick automaton and
+    a hit only counts when it sits on token boundaries, so 'Java' does not match
+    inside "JavaScript" and 'Git' does not match inside "digital".
+    Case-sensitive skills (e.g. 'Go', 'Spark') must appear exactly as written
+    """
+
+    def __init__(self, taxonomy):
+        self.taxonomy = tuple(taxonomy)
+        self.skills = [name for name, _, _ in taxonomy]
+        # Changes whenever the taxonomy or the matching rules do, so memoized results can be told apart
+        self.version = hashlib.sha1(json.dumps([MATCHER_REVISION, self.taxonomy]).encode('utf-8')).hexdigest()
+
+        # pattern -> list of (skill index, text the original must equal or None)
+        patterns = {}
+        for index, (name, aliases, case_sensitive) in enumerate(taxonomy):
+            patterns.setdefault(name.lower(), []).append((index, name if case_sensitive else None))
+            for alias in aliases:
+                patterns.setdefault(alias.lower(), []).append((index, None))
+
+        # Patterns that contain another pattern, e.g. "vue.js" contains "vue"
+        finder = ahocorasick.Automaton()
+        for pattern in patterns:
+            finder.add_word(pattern, len(pattern))
+        finder.make_automaton()
+        has_inner = {
+            pattern: any(length < len(pattern) for _, length in finder.iter(pattern))
+            for pattern in patterns
+        }
+
+        # Each pattern keeps its length, targets, whether its edges need a word
+        # boundary and whether shorter patterns lie inside it. The automaton holds
+        # the pattern's position in this list, so find can tell repeats apart cheaply
+        self._patterns = []
+        self._automaton = ahocorasick.Automaton()
+        for pattern, targets in patterns.items():
+            self._automaton.add_word(pattern, len(self._patterns))
+            self._patterns.append((len(pattern), tuple(targets), _is_word_char(pattern[0]),
+                                   _is_word_char(pattern[-1]), has_inner[pattern]))
+        self._automaton.make_automaton()
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Build a matcher from a taxonomy file
+        """
+        return cls(load_taxonomy(path))
+
+    def find(self, text):
+        """
+        Return the skills mentioned in text, by canonical name, in taxonomy order
+        """
+        lowered = text.lower()
+        # Lowercasing can change the length of some unicode text; skip case checks then
+        original = text if len(lowered) == len(text) else None
+        n = len(lowered)
+
+        # iter_long yields the longest match at each position and skips past it,
+        # so a hit inside a longer one (the 'js' in "Node.js") is never reported
+        found = set()
+        # Patterns already counted for every skill they name; skill-dense text repeats
+        # the same few patterns many times, and those repeats have nothing left to add
+        done = set()
+        patterns = self._patterns
+        for end, pattern_id in self._automaton.iter_long(lowered):
+            if pattern_id in done:
+                continue
+            length, targets, word_start, word_end, has_inner = patterns[pattern_id]
+            start = end - length + 1
+            # Like \b, an edge only needs a boundary when the match has a word character there
+            if (word_start and start > 0 and _is_word_char(lowered[start - 1])) or \
+                    (word_end and end + 1 < n and _is_word_char(lowered[end + 1])):
+                # The longest hit runs into a word, as "vue.js" does in "Vue.jsx";
+                # a shorter one inside it ("vue") may still stand on its own
+                if has_inner:
+                    for hit_start, hit_end, hit_targets in self._shorter_hits(lowered, start, end, n):
+                        for index, exact in hit_targets:
+                            if exact is None or original is None or original[hit_start:hit_end + 1] == exact:
+                                found.add(index)
+                continue
+            complete = True
+            for index, exact in targets:
+                if exact is None or original is None or original[start:end + 1] == exact:
+                    found.add(index)
+                else:
+                    complete = False
+            if complete:
+                done.add(pattern_id)
+
+        return [self.skills[index] for index in sorted(found)]
+
+    def _shorter_hits(self, lowered, start, end, n):
+        """
+        Matches within lowered[start:end + 1] that sit on token boundaries, taking the
+        longest at each start and skipping those inside one already taken
+        """
+        best = {}
+        for hit_end, pattern_id in self._automaton.iter(lowered, start, end + 1):
+            length, targets, word_start, word_end, _ = self._patterns[pattern_id]
+            hit_start = hit_end - length + 1
+            if not _on_boundaries(lowered, hit_start, hit_end, n, word_start, word_end):
+                continue
+            if hit_start not in best or best[hit_start][0] < hit_end:
+                best[hit_start] = (hit_end, targets)
+
+        hits = []
+        covered_until = -1
+        for hit_start in sorted(best):
+            if hit_start > covered_until:
+                hit_end, targets = best[hit_start]
+                hits.append((hit_start, hit_end, targets))
+                covered_until = hit_end
+        return hits
+
+    def find_many(self, texts, n_jobs=None, min_parallel=PARALLEL_MIN_TEXTS):
+        """
+        Run find over a list of texts, returning results in the original order.
+        Large batches are split across a process pool with one matcher per worker;
+        small ones run in this process
+        """
+        texts = list(texts)
+        n_jobs = n_jobs or os.cpu_count() or 1
+        if n_jobs == 1 or len(texts) < min_parallel:
+            return [self.find(text) for text in texts]
+
+        # A few partitions per worker keeps the pool busy when some texts are longer
+        n_parts = n_jobs * 4
+        size = -(-len(texts) // n_parts)
+        parts = [texts[i:i + size] for i in range(0, len(texts), size)]
+
+        results = []
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=(self.taxonomy,)) as executor:
+            for part in executor.map(_find_part, parts):
+                results.extend(part)
+        return results
+
+
+class SkillMemo:
+    """
+    Memo of extracted skills keyed by a hash of the text and the taxonomy version.
+    Keeps up to max_entries results in an in-memory LRU and, if path is given,
+    up to max_rows of the most recently written results in a SQLite file so they
+    survive restarts. Results from other taxonomy versions are dropped from the
+    file once a new version writes to it
+    """
+
+    def __init__(self, max_entries=100000, path=None, max_rows=1000000):
+        self.max_entries = max_entries
+        self.path = path
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._db = None
+        # Taxonomy version the file was last pruned for
+        self._db_version = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            columns = [row[1] for row in self._db.execute('PRAGMA table_info(skills)')]
+            if columns and 'version' not in columns:
+                # Written before versions were stored; it is only a cache, so start over
+                self._db.execute('DROP TABLE skills')
+            self._db.execute('CREATE TABLE IF NOT EXISTS skills (key TEXT PRIMARY KEY, version TEXT, skills TEXT)')
+
+    @staticmethod
+    def make_key(version, text):
+        """
+        Build the memo key for a text extracted with a given taxonomy version
+        """
+        return hashlib.sha1(f"{version}\0{text}".encode('utf-8')).hexdigest()
+
+    def get_many(self, keys):
+        """
+        Look up several keys at once. Returns a dict of key -> skills for the keys found.
+        A key given more than once counts as one hit or miss
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                skills = self._entries.get(key)
+                if skills is None:
+                    missing.append(key)
+                else:
+                    self._entries.move_to_end(key)
+                    found[key] = list(skills)
+
+            if self._db is not None and missing:
+                # Stay well under SQLite's limit on query parameters
+                for i in range(0, len(missing), 500):
+                    batch = missing[i:i + 500]
+                    rows = self._db.execute(
+                        f"SELECT key, skills FROM skills WHERE key IN ({','.join('?' * len(batch))})", batch
+                    ).fetchall()
+                    for key, skills in rows:
+                        found[key] = json.loads(skills)
+                        self._remember(key, found[key])
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items, version=None):
+        """
+        Store (key, skills) pairs extracted with the given taxonomy version
+        """
+        items = list(items)
+        with self._lock:
+            for key, skills in items:
+                self._remember(key, skills)
+            if self._db is not None and items:
+                if version is not None and version != self._db_version:
+                    # Keys from any other version can never be looked up again
+                    self._db.execute('DELETE FROM skills WHERE version IS NOT ?', (version,))
+                    self._db_version = version
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO skills (key, version, skills) VALUES (?, ?, ?)',
+                    [(key, version, json.dumps(skills)) for key, skills in items]
+                )
+                # New rows get the highest rowids, so the oldest writes sit below this cut
+                self._db.execute(
+                    'DELETE FROM skills WHERE rowid <= (SELECT MAX(rowid) FROM skills) - ?', (self.max_rows,)
+                )
+                self._db.commit()
+
+    def _remember(self, key, skills):
+        self._entries[key] = tuple(skills)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        """
+        Return hit/miss counts and the number of results held in memory
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+
+def _init_worker(taxonomy):
+    global _worker_matcher
+    _worker_matcher = SkillMatcher(taxonomy)
+
+
+def _find_part(texts):
+    return [_worker_matcher.find(text) for text in texts]
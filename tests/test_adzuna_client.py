@@ -0,0 +1,354 @@
+import json
+import threading
+import time
+import types
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+import adzuna_client
+from adzuna_client import AdzunaClient, AsyncAdzunaClient, RateLimiter, iter_async, parse_retry_after, plan_pages
+from response_cache import ResponseCache
+
+# Seconds each response is held back, so parallel pages finish out of order
+LATENCY = 0.05
+
+
+class StandInServer:
+    """
+    Local stand-in for the Adzuna search endpoint holding total_results jobs.
+    Later pages answer faster than earlier ones, so completion order differs from page order
+    """
+
+    def __init__(self, total_results, failing_countries=()):
+        self.total_results = total_results
+        self.failing_countries = set(failing_countries)
+        self.requested_pages = []
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                country, page = url.path.rstrip('/').split('/')[-3], int(url.path.rstrip('/').split('/')[-1])
+                per_page = int(parse_qs(url.query)['results_per_page'][0])
+                with server._lock:
+                    server.requested_pages.append(page)
+
+                time.sleep(LATENCY * max(1, 5 - page))
+                if country in server.failing_countries:
+                    self.send_response(400)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                start = (page - 1) * per_page
+                end = min(start + per_page, server.total_results)
+                results = [{'id': i, 'title': f"Job {i}"} for i in range(start, end)]
+
+                body = json.dumps({'results': results}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.httpd.server_address
+        self.base_url = f"http://{host}:{port}/v1/api/jobs/{{country}}/search/{{page}}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FakeClock:
+    """
+    Stands in for the time module in adzuna_client; sleeping moves the clock forward
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ScriptedSession:
+    """
+    Session whose GETs answer with the given status codes (and headers) in turn
+    """
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        reply = self.replies[self.calls]
+        self.calls += 1
+        if isinstance(reply, Exception):
+            raise reply
+        status, headers = reply if isinstance(reply, tuple) else (reply, {})
+
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response.url = url
+        response._content = json.dumps({'results': [{'id': 1}]}).encode('utf-8')
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(adzuna_client, 'time', types.SimpleNamespace(
+        monotonic=clock.monotonic, sleep=clock.sleep, time=time.time
+    ))
+    return clock
+
+
+def scripted_client(*replies, **kwargs):
+    client = AdzunaClient('id', 'key', base_url="http://adzuna.test/{country}/search/{page}", **kwargs)
+    client.session = ScriptedSession(*replies)
+    return client
+
+
+@pytest.fixture
+def make_client():
+    servers = []
+    clients = []
+
+    def make(total_results, failing_countries=(), **kwargs):
+        server = StandInServer(total_results, failing_countries)
+        client = AdzunaClient('id', 'key', base_url=server.base_url, **kwargs)
+        servers.append(server)
+        clients.append(client)
+        return server, client
+
+    yield make
+    for client in clients:
+        client.close()
+    for server in servers:
+        server.close()
+
+
+def test_pages_are_merged_in_page_order(make_client):
+    server, client = make_client(total_results=1000, max_workers=4)
+
+    jobs = client.search(what='python', country='gb', max_results=200)
+
+    assert [job['id'] for job in jobs] == list(range(200))
+    assert all(job['country'] == 'gb' for job in jobs)
+    assert sorted(server.requested_pages) == [1, 2, 3, 4]
+
+
+def test_short_page_stops_the_search(make_client):
+    server, client = make_client(total_results=70, max_workers=1)
+
+    jobs = client.search(max_results=500)
+
+    # Page 2 holds the last 20 jobs, so nothing after it is kept or requested
+    assert [job['id'] for job in jobs] == list(range(70))
+    assert max(server.requested_pages) <= 3
+
+
+def test_results_are_trimmed_to_max_results(make_client):
+    _, client = make_client(total_results=1000, max_workers=4)
+
+    jobs = client.search(max_results=120)
+
+    assert [job['id'] for job in jobs] == list(range(120))
+
+
+def test_pages_are_fetched_in_parallel(make_client):
+    _, client = make_client(total_results=1000, max_workers=4)
+
+    start = time.monotonic()
+    client.search(max_results=200)
+    elapsed = time.monotonic() - start
+
+    # One after another the four pages would take 4 + 3 + 2 + 1 latency units
+    assert elapsed < LATENCY * 10 * 0.8
+
+
+def test_async_timeout_does_not_include_rate_limiter_wait(make_client):
+    # One request per 0.5s, so the last page waits well past request_timeout for its token
+    _, client = make_client(total_results=1000, rate_limiter=RateLimiter(rate_per_minute=120, burst=1))
+    async_client = AsyncAdzunaClient(client, max_concurrency=4, request_timeout=0.4)
+
+    pages = list(iter_async(async_client.search_many(['python'], ['us'], max_results=150)))
+
+    assert sorted(page for _, _, page, _ in pages) == [1, 2, 3]
+
+
+def test_async_client_can_be_reused_across_event_loops(make_client):
+    _, client = make_client(total_results=1000)
+    async_client = AsyncAdzunaClient(client, max_concurrency=2)
+
+    # iter_async runs each search on its own event loop
+    for _ in range(2):
+        pages = list(iter_async(async_client.search_many(['python'], ['us', 'gb'], max_results=150)))
+        assert len(pages) == 6
+
+
+def test_failing_country_does_not_stop_the_others(make_client):
+    _, client = make_client(total_results=1000, failing_countries=['gb'], pool_size=8)
+    async_client = AsyncAdzunaClient(client, max_concurrency=8)
+    errors = {}
+
+    pages = list(iter_async(async_client.search_many(['python'], ['us', 'gb', 'de'], max_results=150,
+                                                     errors=errors)))
+
+    assert sorted((country, page) for _, country, page, _ in pages) == [
+        ('de', 1), ('de', 2), ('de', 3), ('us', 1), ('us', 2), ('us', 3)
+    ]
+    assert list(errors) == [('python', 'gb')]
+
+
+def test_search_many_raises_without_an_errors_dict(make_client):
+    _, client = make_client(total_results=1000, failing_countries=['gb'])
+    async_client = AsyncAdzunaClient(client)
+
+    with pytest.raises(requests.HTTPError):
+        list(iter_async(async_client.search_many(['python'], ['us', 'gb'], max_results=100)))
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    in_30s = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+
+    assert parse_retry_after('7') == 7.0
+    assert parse_retry_after(in_30s) == pytest.approx(30, abs=2)
+    # A date in the past means retry now
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+
+
+def test_backoff_is_jittered_and_capped():
+    client = AdzunaClient('id', 'key', backoff_base=1.0, backoff_max=5.0)
+
+    for attempt in range(6):
+        delays = [client._backoff(attempt) for _ in range(200)]
+        assert all(0 <= delay <= min(5.0, 2 ** attempt) for delay in delays)
+        assert len(set(delays)) > 1
+
+
+@pytest.mark.parametrize('retry_after', ['3', 'date'])
+def test_429_waits_for_retry_after(clock, retry_after):
+    if retry_after == 'date':
+        retry_after = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    client = scripted_client((429, {'Retry-After': retry_after}), 200)
+
+    assert client.fetch_page('us', 1) == [{'id': 1}]
+
+    assert client.session.calls == 2
+    assert len(clock.sleeps) == 1
+    expected = 3 if retry_after == '3' else 30
+    assert clock.sleeps[0] == pytest.approx(expected, abs=2)
+
+
+def test_503_is_retried_with_backoff(clock):
+    client = scripted_client(503, 503, 200, backoff_base=1.0)
+
+    assert client.fetch_page('us', 1) == [{'id': 1}]
+
+    assert client.session.calls == 3
+    assert len(clock.sleeps) == 2
+    assert 0 <= clock.sleeps[0] <= 1 and 0 <= clock.sleeps[1] <= 2
+
+
+def test_connection_errors_are_retried(clock):
+    client = scripted_client(requests.ConnectionError("reset"), requests.Timeout("slow"), 200)
+
+    assert client.fetch_page('us', 1) == [{'id': 1}]
+    assert client.session.calls == 3
+
+
+def test_retries_stop_after_max_retries(clock):
+    client = scripted_client(*[503] * 10, max_retries=3)
+
+    with pytest.raises(requests.HTTPError):
+        client.fetch_page('us', 1)
+
+    # The first attempt plus three retries
+    assert client.session.calls == 4
+    assert len(clock.sleeps) == 3
+
+
+@pytest.mark.parametrize('status', [400, 401, 404])
+def test_other_client_errors_raise_immediately(clock, status):
+    client = scripted_client(status, 200)
+
+    with pytest.raises(requests.HTTPError):
+        client.fetch_page('us', 1)
+
+    assert client.session.calls == 1
+    assert clock.sleeps == []
+
+
+def test_429_pauses_the_shared_limiter_for_everyone(clock):
+    limiter = RateLimiter(rate_per_minute=600, burst=10)
+    client = scripted_client((429, {'Retry-After': '5'}), 200, rate_limiter=limiter)
+    other = scripted_client(200, rate_limiter=limiter)
+
+    assert client.fetch_page('us', 1) == [{'id': 1}]
+    # The client waited out the pause in the limiter rather than sleeping on its own
+    assert clock.now >= 1005
+    assert 0 in clock.sleeps
+
+    # A 429 seen by one client holds back another one sharing the limiter
+    response = scripted_client((429, {'Retry-After': '5'})).session.get('url')
+    assert client._hold_back(response, 5) == 0
+    start = clock.now
+    assert other.fetch_page('us', 1) == [{'id': 1}]
+    assert clock.now - start >= 5
+
+
+def test_503_does_not_pause_the_shared_limiter(clock):
+    limiter = RateLimiter(rate_per_minute=600, burst=10)
+    client = scripted_client(503, rate_limiter=limiter)
+
+    response = client.session.get('url')
+
+    assert client._hold_back(response, 2) == 2
+    assert limiter._try_acquire() == 0
+
+
+@pytest.mark.parametrize('max_results, expected', [
+    (0, []), (1, [1]), (20, [1]), (50, [1]), (51, [1, 2]), (120, [1, 2, 3])
+])
+def test_plan_pages_always_asks_for_full_pages(max_results, expected):
+    per_page, pages = plan_pages(max_results)
+
+    assert per_page == 50
+    assert pages == expected
+
+
+def test_searches_of_different_sizes_share_cached_pages(make_client, tmp_path):
+    server, client = make_client(total_results=1000, cache=ResponseCache(str(tmp_path)))
+
+    assert [job['id'] for job in client.search('python', 'gb', max_results=10)] == list(range(10))
+    assert [job['id'] for job in client.search('Python ', 'gb', max_results=30)] == list(range(30))
+    assert [job['id'] for job in client.search('python', 'gb', max_results=50)] == list(range(50))
+
+    # Every search read the same 50-result page, fetched once
+    assert server.requested_pages == [1]
+    assert client.cache.stats()['hits'] == 2
@@ -0,0 +1,114 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cluster_store import ClusterModelStore
+from data_processor import JobDataProcessor
+
+SKILLS = JobDataProcessor._skill_matcher.skills
+GROUPS = [SKILLS[:8], SKILLS[15:25], SKILLS[30:40]]
+
+
+def frame(skills):
+    df = pd.DataFrame({'skills': skills})
+    df['skill_count'] = df['skills'].apply(len)
+    return df
+
+
+def make_jobs(n, seed=0):
+    rng = random.Random(seed)
+    return frame([rng.sample(rng.choice(GROUPS), rng.randint(1, 5)) for _ in range(n)])
+
+
+def make_mixed_jobs(n, seed=1):
+    # Postings asking for skills from every group sit far from all the centroids
+    rng = random.Random(seed)
+    return frame([[skill for group in GROUPS for skill in rng.sample(group, 2)] for _ in range(n)])
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / 'models' / 'cluster_models.pkl')
+
+
+@pytest.mark.parametrize('engine', ['kmeans', 'minibatch'])
+def test_saved_model_is_reloaded_and_only_predicts(store_path, engine):
+    df = make_jobs(2000)
+    fitted = JobDataProcessor(df, model_store=ClusterModelStore(store_path)).cluster_jobs(3, engine=engine)
+
+    # A new store reads the model back from disk
+    store = ClusterModelStore(store_path)
+    saved = store.get(engine)
+    assert saved is not None
+    assert saved['model'].n_clusters == 3
+
+    processor = JobDataProcessor(df, model_store=store)
+    labels = processor.cluster_jobs(3, engine=engine)['cluster']
+
+    np.testing.assert_array_equal(labels.to_numpy(), fitted['cluster'].to_numpy())
+    assert processor.cluster_drift == pytest.approx(1.0)
+    # Predicting neither refits nor replaces the saved model
+    assert store.get(engine) is saved
+    assert store.refits == 0 and not store.refitting()
+
+
+def test_different_cluster_count_refits_and_saves(store_path):
+    df = make_jobs(1000)
+    store = ClusterModelStore(store_path)
+    JobDataProcessor(df, model_store=store).cluster_jobs(3)
+
+    JobDataProcessor(df, model_store=store).cluster_jobs(4)
+
+    assert ClusterModelStore(store_path).get('kmeans')['model'].n_clusters == 4
+
+
+def test_drift_triggers_a_background_refit(store_path):
+    store = ClusterModelStore(store_path, drift_threshold=1.1)
+    JobDataProcessor(make_jobs(1000), model_store=store).cluster_jobs(3)
+    baseline = store.get('kmeans')['baseline_distance']
+
+    processor = JobDataProcessor(make_mixed_jobs(1000), model_store=store)
+    processor.cluster_jobs(3)
+    store.wait()
+
+    assert processor.cluster_drift > 1.1
+    assert store.refits == 1
+    assert store.last_error is None
+    assert ClusterModelStore(store_path).get('kmeans')['baseline_distance'] != baseline
+
+
+def test_failed_refit_is_recorded_and_keeps_the_model(store_path):
+    store = ClusterModelStore(store_path)
+    JobDataProcessor(make_jobs(500), model_store=store).cluster_jobs(3)
+    saved = store.get('kmeans')
+
+    def fail():
+        raise ValueError("fit failed")
+
+    assert store.refit_in_background('kmeans', fail)
+    store.wait()
+
+    assert isinstance(store.last_error, ValueError)
+    assert store.refits == 0
+    assert store.get('kmeans') is saved
+
+
+def test_identical_training_rows_give_no_drift_signal(store_path):
+    store = ClusterModelStore(store_path, drift_threshold=1.1)
+    JobDataProcessor(frame([['Python', 'SQL']] * 50), model_store=store).cluster_jobs(1)
+    assert store.get('kmeans')['baseline_distance'] == 0
+
+    processor = JobDataProcessor(make_mixed_jobs(200), model_store=store)
+    processor.cluster_jobs(1)
+
+    assert processor.cluster_drift is None
+    assert not store.refitting()
+    assert store.refits == 0
+
+
+def test_unreadable_file_starts_empty(tmp_path):
+    path = tmp_path / 'broken.pkl'
+    path.write_bytes(b'not a pickle')
+    assert ClusterModelStore(str(path)).get('kmeans') is None
@@ -0,0 +1,87 @@
+import random
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processor import JobDataProcessor
+
+SKILLS = ['AWS', 'Docker', 'Go', 'Java', 'Python', 'React', 'SQL']
+TYPES = ['contract', 'permanent', 'temporary']
+QUANTILES = (0.25, 0.5, 0.75)
+TRIALS = 60
+
+
+def random_jobs(rng):
+    n = rng.randrange(1, 60)
+    df = pd.DataFrame({
+        'cluster': [rng.choice([0, 1, 2, 4, np.nan]) for _ in range(n)],
+        'avg_salary': [rng.choice([np.nan, 40000.0, rng.uniform(2e4, 2e5)]) for _ in range(n)],
+        'skills': [rng.sample(SKILLS, rng.randrange(0, 4)) for _ in range(n)],
+        # Small clusters with few types, so the mode is often tied
+        'type': [rng.choice(TYPES + [None]) for _ in range(n)]
+    })
+    df['skill_count'] = df['skills'].apply(len)
+    if rng.random() < 0.5:
+        df['type'] = df['type'].astype('category')
+    return df
+
+
+def reference_cluster_summary(df, top_skills, quantiles):
+    """
+    The original groupby aggregation, plus per-cluster skill counts and salary quantiles
+    """
+    grouped = df.groupby('cluster')
+    summary = grouped.agg({
+        'avg_salary': ['mean', 'std', 'count'],
+        'skill_count': ['mean', 'std'],
+        'type': lambda x: x.mode()[0] if not x.mode().empty else 'Unknown'
+    })
+    summary = summary.rename(columns={'<lambda>': 'mode'})
+
+    top = {}
+    for cluster, group in grouped:
+        counts = Counter(skill for skills in group['skills'] for skill in skills)
+        # Most common first, ties by name
+        ranked = sorted(counts, key=lambda skill: (-counts[skill], skill))[:top_skills]
+        top[cluster] = ', '.join(ranked)
+    summary[('skills', 'top')] = pd.Series(top)
+
+    for q in quantiles:
+        summary[('avg_salary', f"p{q * 100:g}")] = grouped['avg_salary'].quantile(q)
+    return summary.round(2)
+
+
+@pytest.mark.parametrize('seed', range(TRIALS))
+def test_cluster_summary_matches_groupby(seed):
+    rng = random.Random(seed)
+    df = random_jobs(rng)
+    if df['cluster'].isna().all():
+        df.loc[0, 'cluster'] = 0
+
+    summary = JobDataProcessor(df).get_cluster_summary(top_skills=3, quantiles=QUANTILES)
+    expected = reference_cluster_summary(df, 3, QUANTILES)
+
+    assert list(summary.index) == list(expected.index)
+    assert list(summary.columns) == list(expected.columns)
+    assert list(summary[('type', 'mode')]) == list(expected[('type', 'mode')])
+    assert list(summary[('skills', 'top')]) == list(expected[('skills', 'top')])
+    assert list(summary[('avg_salary', 'count')]) == list(expected[('avg_salary', 'count')])
+    for column in [('avg_salary', 'mean'), ('avg_salary', 'std'), ('skill_count', 'mean'), ('skill_count', 'std'),
+                   ('avg_salary', 'p25'), ('avg_salary', 'p50'), ('avg_salary', 'p75')]:
+        # Both sides round to cents, which can land a cent apart
+        np.testing.assert_allclose(summary[column], expected[column], atol=0.0101, equal_nan=True,
+                                   err_msg=str(column))
+
+
+def test_tied_mode_goes_to_the_first_type():
+    df = pd.DataFrame({
+        'cluster': [0, 0, 0, 0, 1, 1],
+        'type': ['temporary', 'permanent', 'permanent', 'temporary', None, None],
+        'avg_salary': [1.0] * 6
+    })
+
+    summary = JobDataProcessor(df).get_cluster_summary(top_skills=0, quantiles=())
+
+    assert list(summary[('type', 'mode')]) == ['permanent', 'Unknown']
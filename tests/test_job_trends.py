@@ -0,0 +1,91 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processor import JobDataProcessor, JobTrendSeries
+
+# Resample rules giving the same buckets: weeks start on Monday and every bucket is labelled by its start
+RESAMPLE_RULES = {'hour': 'h', 'day': 'D', 'week': 'W-MON', 'month': 'MS'}
+
+
+def random_times(rng, n, tz=None):
+    start = pd.Timestamp('2023-11-20', tz=tz)
+    times = [start + pd.Timedelta(minutes=rng.randrange(0, 120 * 24 * 60)) for _ in range(n)]
+    # Some postings have no date
+    return pd.Series([pd.NaT if rng.random() < 0.1 else time for time in times], dtype=f"datetime64[ns{', ' + tz if tz else ''}]")
+
+
+def reference_counts(created_at, freq):
+    created_at = created_at.dropna()
+    if created_at.dt.tz is not None:
+        created_at = created_at.dt.tz_convert('UTC')
+    ones = pd.Series(1, index=pd.DatetimeIndex(created_at))
+    return ones.resample(RESAMPLE_RULES[freq], closed='left', label='left').sum()
+
+
+def assert_counts_equal(series, expected):
+    assert list(series.index) == list(expected.index)
+    np.testing.assert_array_equal(series.to_numpy(), expected.to_numpy())
+
+
+@pytest.mark.parametrize('freq', list(RESAMPLE_RULES))
+@pytest.mark.parametrize('seed', range(10))
+def test_incremental_adds_match_resample(seed, freq):
+    rng = random.Random(seed)
+    tz = rng.choice([None, 'UTC', 'US/Eastern'])
+    times = random_times(rng, rng.randrange(1, 400), tz)
+    if freq == 'hour':
+        times = times.iloc[:40]
+    series = JobTrendSeries(freq)
+
+    # Chunks arrive out of time order, so the range grows at both ends
+    cuts = sorted(rng.sample(range(1, len(times)), min(3, len(times) - 1))) if len(times) > 1 else []
+    chunks = [times.iloc[a:b] for a, b in zip([0] + cuts, cuts + [len(times)])]
+    rng.shuffle(chunks)
+    seen = times.iloc[:0]
+    for chunk in chunks:
+        chunk = chunk.sort_values(ascending=rng.random() < 0.5)
+        series.add(chunk)
+        seen = pd.concat([seen, chunk])
+        if seen.notna().any():
+            assert_counts_equal(series.to_series(), reference_counts(seen, freq))
+
+
+def test_week_buckets_start_on_monday():
+    # Sunday night and Monday morning fall in different weeks
+    series = JobTrendSeries('week')
+    series.add(pd.to_datetime(['2024-03-10 23:00', '2024-03-11 01:00', '2024-03-17 12:00']))
+
+    counts = series.to_series()
+
+    assert list(counts.index) == [pd.Timestamp('2024-03-04'), pd.Timestamp('2024-03-11')]
+    assert list(counts) == [1, 2]
+
+
+@pytest.mark.parametrize('freq', ['day', 'week', 'month'])
+@pytest.mark.parametrize('seed', range(5))
+def test_append_jobs_updates_trends_incrementally(seed, freq):
+    rng = random.Random(seed)
+    times = random_times(rng, 300, 'UTC')
+    frames = [pd.DataFrame({'created_at': times.iloc[i:i + 75], 'title': 'job'}) for i in range(0, 300, 75)]
+
+    processor = JobDataProcessor(frames[0].reset_index(drop=True))
+    processor.get_job_trends(freq)
+    series = processor._trend_series(freq)
+    for frame in frames[1:]:
+        processor.append_jobs(frame)
+
+    trends = processor.get_job_trends(freq, window=3)
+
+    # The cached series was updated in place rather than recounted
+    assert processor._trend_series(freq) is series
+    expected = reference_counts(times, freq)
+    assert list(trends['date']) == list(expected.index)
+    np.testing.assert_array_equal(trends['count'], expected.to_numpy())
+    rolling = expected.rolling(3, min_periods=1)
+    np.testing.assert_allclose(trends['moving_avg'], rolling.mean(), rtol=1e-12)
+    np.testing.assert_allclose(trends['moving_std'], rolling.std(), rtol=1e-12, equal_nan=True)
+    fresh = JobDataProcessor(pd.concat(frames, ignore_index=True)).get_job_trends(freq, window=3)
+    pd.testing.assert_frame_equal(trends, fresh)
@@ -0,0 +1,82 @@
+import random
+
+import pandas as pd
+import pytest
+
+from data_processor import apply_job_schema, normalize_salaries, parse_created, process_jobs
+
+
+def reference_process_jobs(jobs):
+    """
+    The original dict-per-job loop, followed by the date parse clean_data used to do
+    """
+    processed_jobs = []
+    for job in jobs:
+        processed_jobs.append({
+            'title': job.get('title', ''),
+            'company': job.get('company', {}).get('display_name', ''),
+            'location': job.get('location', {}).get('display_name', ''),
+            'description': job.get('description', ''),
+            'type': job.get('contract_type', ''),
+            'created_at': job.get('created', ''),
+            'url': job.get('redirect_url', ''),
+            'salary_min': job.get('salary_min', 0),
+            'salary_max': job.get('salary_max', 0),
+            'category': job.get('category', {}).get('label', ''),
+            'country': job.get('country', '')
+        })
+    df = normalize_salaries(pd.DataFrame(processed_jobs))
+    df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
+    return apply_job_schema(df)
+
+
+def random_job(rng, i):
+    job = {
+        'title': f"Developer {i}",
+        'company': {'display_name': rng.choice(['Acme', 'Globex', 'Initech'])},
+        'location': {'display_name': rng.choice(['London', 'Berlin', 'Austin'])},
+        'description': "Python and SQL",
+        'contract_type': rng.choice(['permanent', 'contract']),
+        'created': f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:15:00Z",
+        'redirect_url': f"https://example.com/{i}",
+        'salary_min': rng.uniform(20000, 60000),
+        'salary_max': rng.uniform(60000, 120000),
+        'category': {'label': 'IT Jobs'},
+        'country': rng.choice(['gb', 'us', 'de', 'xx'])
+    }
+    # Adzuna leaves out fields it has no value for
+    for key in rng.sample(['company', 'contract_type', 'salary_min', 'salary_max', 'category'], rng.randint(0, 2)):
+        del job[key]
+    return job
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_process_jobs_matches_reference(seed):
+    rng = random.Random(seed)
+    jobs = [random_job(rng, i) for i in range(rng.randint(1, 60))]
+
+    pd.testing.assert_frame_equal(process_jobs(jobs), reference_process_jobs(jobs))
+
+
+def test_process_jobs_without_jobs():
+    assert process_jobs([]).empty
+
+
+def test_parse_created_reads_adzuna_timestamps_as_utc():
+    parsed = parse_created(['2024-01-15T10:30:00Z', '2023-12-31T23:59:59Z'])
+
+    assert str(parsed.dtype) == 'datetime64[ns, UTC]'
+    assert list(parsed) == [pd.Timestamp('2024-01-15 10:30:00', tz='UTC'), pd.Timestamp('2023-12-31 23:59:59', tz='UTC')]
+
+
+@pytest.mark.parametrize('values', [
+    ['2024-01-15T10:30:00Z', ''],
+    ['2024-01-15T10:30:00Z', None],
+    ['2024-01-15T12:30:00+02:00', '2024-01-16T08:00:00+02:00'],
+    ['2024-01-15T10:30:00Z', '2024-02-30T10:30:00Z']
+])
+def test_parse_created_falls_back_to_pandas(values):
+    parsed = parse_created(values)
+    expected = pd.to_datetime(values, errors='coerce')
+
+    assert parsed.equals(expected)
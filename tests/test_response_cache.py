@@ -0,0 +1,91 @@
+import os
+import time
+
+import pytest
+
+from response_cache import ResponseCache
+
+
+def page(n):
+    return {'results': [{'id': i, 'title': f"Job {i}"} for i in range(n, n + 20)]}
+
+
+def entry_path(cache, key):
+    return os.path.join(cache.cache_dir, cache._filename(key))
+
+
+def set_times(cache, key, accessed, modified):
+    os.utime(entry_path(cache, key), (accessed, modified))
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / 'cache')
+
+
+def test_round_trip_and_key_normalisation(cache_dir):
+    cache = ResponseCache(cache_dir)
+    cache.put(cache.make_key('gb', 1, 'Python ', 50), page(0))
+
+    assert cache.get(cache.make_key('gb', '1', 'python', 50)) == page(0)
+    assert cache.get(cache.make_key('us', 1, 'python', 50)) is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_entries_expire_after_ttl(cache_dir):
+    cache = ResponseCache(cache_dir, ttl=60)
+    fresh, stale = cache.make_key('gb', 1, 'python', 50), cache.make_key('gb', 2, 'python', 50)
+    cache.put(fresh, page(0))
+    cache.put(stale, page(50))
+    now = time.time()
+    set_times(cache, fresh, now, now - 30)
+    set_times(cache, stale, now, now - 90)
+
+    assert cache.get(fresh) == page(0)
+    assert cache.get(stale) is None
+    # The expired entry is deleted rather than kept around
+    assert not os.path.exists(entry_path(cache, stale))
+    assert cache.stats()['entries'] == 1
+
+
+def test_least_recently_used_entries_are_evicted(cache_dir):
+    keys = [ResponseCache.make_key('gb', n, 'python', 50) for n in range(1, 5)]
+    probe = ResponseCache(cache_dir)
+    probe.put(keys[0], page(0))
+    size = probe.stats()['bytes']
+    probe.clear()
+
+    # Room for about three entries
+    cache = ResponseCache(cache_dir, max_bytes=int(size * 3.5))
+    for n, key in enumerate(keys[:3]):
+        cache.put(key, page(n))
+    cache.get(keys[0])
+    cache.put(keys[3], page(3))
+
+    assert cache.get(keys[1]) is None
+    assert [cache.get(key) is not None for key in (keys[0], keys[2], keys[3])] == [True, True, True]
+    assert cache.stats()['bytes'] <= cache.max_bytes
+
+
+def test_index_is_rebuilt_from_disk_on_restart(cache_dir):
+    cache = ResponseCache(cache_dir)
+    keys = [cache.make_key('gb', n, 'python', 50) for n in range(1, 4)]
+    for n, key in enumerate(keys):
+        cache.put(key, page(n))
+    # Last used: key 1, then key 3, then key 2
+    now = time.time()
+    for key, accessed in zip(keys, [now - 300, now - 100, now - 200]):
+        set_times(cache, key, accessed, now - 10)
+    # Stray temporary files are not entries
+    open(os.path.join(cache_dir, 'partial.json.gz.123.tmp'), 'wb').close()
+    stats = cache.stats()
+
+    restarted = ResponseCache(cache_dir, max_bytes=stats['bytes'])
+
+    assert restarted.stats()['entries'] == 3
+    assert restarted.stats()['bytes'] == stats['bytes']
+    assert list(restarted._entries) == [restarted._filename(keys[i]) for i in (0, 2, 1)]
+    # A new entry pushes out the one used longest ago
+    restarted.put(restarted.make_key('gb', 4, 'python', 50), page(3))
+    assert restarted.get(keys[0]) is None
+    assert restarted.get(keys[1]) == page(1)
@@ -0,0 +1,98 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processor import JobDataProcessor, grouped_quantiles
+
+SKILLS = ['AWS', 'C++', 'Docker', 'Go', 'Java', 'Python', 'React', 'SQL']
+QUANTILES = (0, 0.1, 0.25, 0.5, 0.75, 0.9, 1)
+TRIALS = 100
+
+
+def random_salaries(rng, n):
+    # Repeated values and missing salaries, as real postings have
+    return [rng.choice([np.nan, rng.choice([30000.0, 50000.0]), rng.uniform(1e4, 2e5)]) for _ in range(n)]
+
+
+def reference_salary_stats(df, quantiles):
+    """
+    The pandas groupby over one row per (posting, skill) pair
+    """
+    pairs = df.assign(skills=df['skills'].apply(lambda skills: sorted(set(skills)))).explode('skills')
+    pairs = pairs.dropna(subset=['skills'])
+    grouped = pairs.groupby('skills')['avg_salary']
+    stats = pd.DataFrame({
+        'count': grouped.count(),
+        'sum': grouped.sum(),
+        'mean': grouped.mean(),
+        'var': grouped.var()
+    })
+    for q in quantiles:
+        stats[f"p{q * 100:g}"] = grouped.quantile(q)
+    stats.index.name = None
+    return stats
+
+
+@pytest.mark.parametrize('seed', range(TRIALS))
+def test_salary_stats_match_groupby(seed):
+    rng = random.Random(seed)
+    n = rng.randrange(1, 40)
+    df = pd.DataFrame({
+        'skills': [[rng.choice(SKILLS) for _ in range(rng.randrange(0, 4))] for _ in range(n)],
+        'avg_salary': random_salaries(rng, n)
+    })
+    if not any(df['skills'].apply(len)):
+        df.loc[0, 'skills'] = ['Python']
+
+    stats = JobDataProcessor(df).salary_stats_by_skill(quantiles=QUANTILES)
+    expected = reference_salary_stats(df, QUANTILES)
+
+    assert list(stats.index) == list(expected.index)
+    assert list(stats.columns) == list(expected.columns)
+    np.testing.assert_array_equal(stats['count'], expected['count'])
+    for column in expected.columns[1:]:
+        np.testing.assert_allclose(stats[column], expected[column], rtol=1e-9, atol=1e-6, equal_nan=True,
+                                   err_msg=column)
+
+
+def test_salary_by_skill_matches_the_original_loop():
+    rng = random.Random(0)
+    df = pd.DataFrame({
+        'skills': [rng.sample(SKILLS, rng.randrange(0, 4)) for _ in range(200)],
+        'avg_salary': random_salaries(rng, 200)
+    })
+    df.loc[df['skills'].apply(lambda skills: 'Go' in skills), 'avg_salary'] = np.nan
+
+    result = JobDataProcessor(df).analyze_salary_by_skill()
+
+    # The loop analyze_salary_by_skill used to run, one boolean mask per skill
+    expected = {}
+    for skill in set(skill for skills in df['skills'] for skill in skills):
+        mean = df[df['skills'].apply(lambda skills: skill in skills)]['avg_salary'].mean()
+        if not np.isnan(mean):
+            expected[skill] = mean
+    expected = pd.Series(expected).sort_values(ascending=False)
+
+    assert 'Go' not in result.index
+    assert list(result.index) == list(expected.index)
+    np.testing.assert_allclose(result, expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_grouped_quantiles_match_numpy(seed):
+    rng = np.random.default_rng(seed)
+    n_groups = int(rng.integers(1, 8))
+    groups = rng.integers(0, n_groups, int(rng.integers(0, 60)))
+    # Few distinct values, so ties are common, and some NaN
+    values = rng.choice([1.0, 2.0, 2.5, 7.0, np.nan], len(groups))
+    quantiles = [0, 0.3, 0.5, 0.99, 1]
+
+    results = grouped_quantiles(groups, values, n_groups, quantiles)
+
+    for q, result in zip(quantiles, results):
+        for group in range(n_groups):
+            in_group = values[(groups == group) & ~np.isnan(values)]
+            expected = np.quantile(in_group, q) if len(in_group) else np.nan
+            np.testing.assert_allclose(result[group], expected, rtol=1e-12, equal_nan=True)
@@ -0,0 +1,137 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from data_processor import SKILL_TAXONOMY_PATH, JobDataProcessor
+from skill_matcher import SkillMatcher, SkillMemo
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return SkillMatcher.from_file(SKILL_TAXONOMY_PATH)
+
+
+@pytest.mark.parametrize('text, expected', [
+    # A longer alias running into a word must not hide a shorter match at the same start
+    ("Vue.jsx components", ['Vue']),
+    ("React.jsx views", ['React']),
+    ("google cloud platforms", ['GCP']),
+    # Edges that are not word characters need no boundary, as with \b
+    ("c++11 and c#.", ['C++', 'C#']),
+    # Longest match wins, so 'js' inside "Node.js" is not reported
+    ("Node.js and React.js", ['React', 'Node.js']),
+    ("Java and JavaScript", ['Java', 'JavaScript']),
+    # Word boundaries
+    ("digital marketing", []),
+    ("a go-getter who can react quickly", []),
+    # Aliases and case-sensitive names
+    ("We use Go and golang, k8s and postgres", ['PostgreSQL', 'Go', 'Kubernetes']),
+    ("ml and ai", ['Machine Learning', 'Artificial Intelligence']),
+    # A case-sensitive skill still counts when an earlier mention had the wrong case
+    ("go, GO and then Go", ['Go']),
+    ("python " * 50 + "Spark", ['Python', 'Spark']),
+])
+def test_find(matcher, text, expected):
+    assert sorted(matcher.find(text)) == sorted(expected)
+
+
+def test_find_returns_taxonomy_order(matcher):
+    found = matcher.find("Rust, Python and SQL")
+    assert found == sorted(found, key=matcher.skills.index)
+
+
+def test_find_many_matches_find(matcher):
+    texts = ["Vue.jsx", "c++11", "python", "", "Spark and pyspark"] * 10
+    assert matcher.find_many(texts, n_jobs=2, min_parallel=1) == [matcher.find(text) for text in texts]
+
+
+def test_version_changes_with_taxonomy(matcher):
+    other = SkillMatcher(matcher.taxonomy[:-1])
+    assert other.version != matcher.version
+    assert SkillMemo.make_key(other.version, "text") != SkillMemo.make_key(matcher.version, "text")
+
+
+def count_rows(path):
+    with sqlite3.connect(path) as db:
+        return db.execute('SELECT COUNT(*) FROM skills').fetchone()[0]
+
+
+def test_memo_reads_back_from_its_file(tmp_path):
+    path = str(tmp_path / 'skills.sqlite')
+    SkillMemo(path=path).put_many([('a', ['Python']), ('b', [])], 'v1')
+
+    memo = SkillMemo(path=path)
+
+    assert memo.get_many(['a', 'b', 'c']) == {'a': ['Python'], 'b': []}
+    assert memo.stats() == {'hits': 2, 'misses': 1, 'entries': 2}
+
+
+def test_memo_counts_repeated_keys_once():
+    memo = SkillMemo()
+    memo.put_many([('a', ['SQL'])], 'v1')
+
+    memo.get_many(['a', 'a', 'b', 'b', 'b'])
+
+    assert memo.stats()['hits'] == 1
+    assert memo.stats()['misses'] == 1
+
+
+def test_memo_file_drops_other_taxonomy_versions(tmp_path):
+    path = str(tmp_path / 'skills.sqlite')
+    SkillMemo(path=path).put_many([('old-1', ['Go']), ('old-2', ['Rust'])], 'v1')
+
+    memo = SkillMemo(path=path)
+    memo.put_many([('new-1', ['Go'])], 'v2')
+
+    assert count_rows(path) == 1
+    assert SkillMemo(path=path).get_many(['old-1', 'old-2', 'new-1']) == {'new-1': ['Go']}
+
+
+def test_memo_file_keeps_the_latest_max_rows(tmp_path):
+    path = str(tmp_path / 'skills.sqlite')
+    memo = SkillMemo(path=path, max_rows=5)
+    for i in range(8):
+        memo.put_many([(f"k{i}", [])], 'v1')
+    # Rewriting a key makes it the newest row
+    memo.put_many([('k3', ['SQL'])], 'v1')
+
+    assert count_rows(path) == 5
+    found = SkillMemo(path=path).get_many([f"k{i}" for i in range(8)])
+    assert set(found) == {'k3', 'k4', 'k5', 'k6', 'k7'}
+    assert found['k3'] == ['SQL']
+
+
+def test_memo_replaces_a_file_without_versions(tmp_path):
+    path = str(tmp_path / 'skills.sqlite')
+    with sqlite3.connect(path) as db:
+        db.execute('CREATE TABLE skills (key TEXT PRIMARY KEY, skills TEXT)')
+        db.execute("INSERT INTO skills VALUES ('a', '[\"Go\"]')")
+
+    memo = SkillMemo(path=path)
+    memo.put_many([('b', ['SQL'])], 'v1')
+
+    assert memo.get_many(['a', 'b']) == {'b': ['SQL']}
+
+
+def test_taxonomy_change_reextracts_memoized_descriptions(matcher, tmp_path):
+    path = str(tmp_path / 'skills.sqlite')
+    descriptions = pd.Series(["Python and Rust", "Python and Rust", None, "SQL"])
+
+    memo = SkillMemo(path=path)
+    first = JobDataProcessor(pd.DataFrame(), matcher, memo).extract_skills_batch(descriptions)
+    assert memo.stats()['misses'] == 2
+
+    # A new session reads the results back from the file
+    memo = SkillMemo(path=path)
+    again = JobDataProcessor(pd.DataFrame(), matcher, memo).extract_skills_batch(descriptions)
+    assert again.tolist() == first.tolist()
+    assert memo.stats() == {'hits': 2, 'misses': 0, 'entries': 2}
+
+    # Without Rust in the taxonomy nothing memoized under the old version is reused
+    without_rust = SkillMatcher([entry for entry in matcher.taxonomy if entry[0] != 'Rust'])
+    memo = SkillMemo(path=path)
+    changed = JobDataProcessor(pd.DataFrame(), without_rust, memo).extract_skills_batch(descriptions)
+    assert changed.tolist() == [['Python'], ['Python'], [], ['SQL']]
+    assert memo.stats()['misses'] == 2
+    assert count_rows(path) == 2
@@ -0,0 +1,104 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processor import JobDataProcessor
+
+SKILLS = ['AWS', 'C++', 'Docker', 'Go', 'Java', 'Python', 'React', 'SQL']
+TRIALS = 300
+
+
+def reference_skill_matrix(df):
+    """
+    Dense skill matrix built row by row from positions, never from index labels
+    """
+    skills = sorted({skill for skills in df['skills'] for skill in skills})
+    dense = np.zeros((len(df), len(skills)), dtype=np.uint8)
+    for position, row_skills in enumerate(df['skills']):
+        for skill in row_skills:
+            dense[position, skills.index(skill)] = 1
+    return pd.DataFrame(dense, index=df.index, columns=skills)
+
+
+def random_index(rng, n):
+    kind = rng.choice(['range', 'shuffled', 'string', 'offset', 'duplicate'])
+    if kind == 'range':
+        return pd.RangeIndex(n)
+    if kind == 'shuffled':
+        labels = list(range(n))
+        rng.shuffle(labels)
+        return pd.Index(labels)
+    if kind == 'string':
+        return pd.Index([f"job-{rng.randrange(10 ** 6)}-{i}" for i in range(n)])
+    if kind == 'offset':
+        return pd.RangeIndex(1000, 1000 + n)
+    # Few distinct labels, so most of them repeat
+    return pd.Index([rng.randrange(max(1, n // 3)) for _ in range(n)])
+
+
+def random_jobs(rng):
+    n = rng.randrange(0, 40)
+    # Duplicated skills within a posting must still count once
+    skills = [[rng.choice(SKILLS) for _ in range(rng.randrange(0, 5))] for _ in range(n)]
+    df = pd.DataFrame({'skills': skills, 'avg_salary': [rng.uniform(1, 100) for _ in range(n)]})
+    df.index = random_index(rng, n)
+    return df
+
+
+def assert_matches_reference(processor):
+    expected = reference_skill_matrix(processor.df)
+    actual = processor.create_skill_matrix()
+    if expected.shape[1] == 0:
+        assert actual.empty
+        return
+
+    assert list(actual.columns) == list(expected.columns)
+    assert actual.index.equals(expected.index)
+    np.testing.assert_array_equal(actual.sparse.to_dense().to_numpy(), expected.to_numpy())
+
+
+@pytest.mark.parametrize('seed', range(TRIALS))
+def test_skill_matrix_matches_reference(seed):
+    rng = random.Random(seed)
+    df = random_jobs(rng)
+    processor = JobDataProcessor(df)
+    assert_matches_reference(processor)
+
+    # A filtered subset, in a random order, as the dashboard's salary filter produces
+    if len(df):
+        mask = [rng.random() < 0.6 for _ in range(len(df))]
+        index = df.index[mask]
+        if index.is_unique:
+            index = index[rng.sample(range(len(index)), len(index))]
+        subset = processor.subset(index)
+        assert_matches_reference(subset)
+        # The cached matrix is reused on a second call
+        builds = subset.skill_matrix_builds
+        assert_matches_reference(subset)
+        assert subset.skill_matrix_builds == builds
+
+
+def test_subset_slices_the_parent_matrix():
+    rng = random.Random(0)
+    df = random_jobs(rng)
+    while len(df) < 10 or not df.index.is_unique:
+        df = random_jobs(rng)
+    processor = JobDataProcessor(df)
+    processor.get_skill_matrix()
+
+    subset = processor.subset(df.index[::2])
+
+    assert_matches_reference(subset)
+    assert subset.skill_matrix_builds == 0
+
+
+def test_edited_skills_rebuild_the_matrix():
+    df = pd.DataFrame({'skills': [['Python'], ['SQL', 'Go'], []]}, index=['a', 'b', 'c'])
+    processor = JobDataProcessor(df)
+    assert_matches_reference(processor)
+
+    processor.df['skills'] = [['Java'], [], ['Java', 'React']]
+    processor.invalidate_skill_matrix()
+    assert_matches_reference(processor)
@@ -0,0 +1,107 @@
+import math
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processor import RELATIONSHIP_METRICS, JobDataProcessor
+
+SKILLS = ['AWS', 'Docker', 'Go', 'Java', 'Python', 'React', 'SQL']
+TRIALS = 100
+
+
+def random_jobs(rng):
+    n = rng.randrange(1, 30)
+    # Few skills and small frames, so equal scores and equal counts are common
+    skills = [rng.sample(SKILLS, rng.randrange(0, 4)) for _ in range(n)]
+    return pd.DataFrame({'skills': skills})
+
+
+def dense_skills(df):
+    skills = sorted({skill for row in df['skills'] for skill in row})
+    return pd.DataFrame([[int(skill in row) for skill in skills] for row in df['skills']],
+                        columns=skills, dtype=np.int64)
+
+
+def reference_score(metric, dense, a, b):
+    n = len(dense)
+    both = int((dense[a] & dense[b]).sum())
+    count_a, count_b = int(dense[a].sum()), int(dense[b].sum())
+    if metric == 'correlation':
+        # The phi coefficient; test_correlation_matches_dataframe_corr checks it against DataFrame.corr
+        denominator = math.sqrt(count_a * (n - count_a) * count_b * (n - count_b))
+        return (n * both - count_a * count_b) / denominator if denominator else math.nan
+    if metric == 'jaccard':
+        return both / (count_a + count_b - both)
+    lift = both * n / (count_a * count_b)
+    return lift if metric == 'lift' else math.log2(lift)
+
+
+def reference_related_skills(df, k, metric, min_cooccurrence, only=None):
+    """
+    Pair by pair with pandas: best score first, then most co-occurrences, then skill name
+    """
+    dense = dense_skills(df)
+    rows = []
+    for a in dense.columns:
+        if only is not None and a != only:
+            continue
+        candidates = []
+        for b in dense.columns:
+            both = int((dense[a] & dense[b]).sum())
+            if a == b or both < min_cooccurrence:
+                continue
+            score = reference_score(metric, dense, a, b)
+            # Undefined scores go last, as NaN does in a sort
+            candidates.append((math.isnan(score), 0 if math.isnan(score) else -score, -both, b, score))
+        for _, _, negative_both, b, score in sorted(candidates)[:k]:
+            rows.append((a, b, -negative_both, score))
+    return rows
+
+
+@pytest.mark.parametrize('seed', range(TRIALS))
+def test_related_skills_matches_reference(seed):
+    rng = random.Random(seed)
+    df = random_jobs(rng)
+    metric = rng.choice(RELATIONSHIP_METRICS)
+    k = rng.randrange(1, 5)
+    min_cooccurrence = rng.choice([1, 1, 2])
+    processor = JobDataProcessor(df)
+
+    result = processor.related_skills(k=k, metric=metric, min_cooccurrence=min_cooccurrence)
+    expected = reference_related_skills(df, k, metric, min_cooccurrence)
+
+    assert list(zip(result['skill'], result['related_skill'], result['cooccurrence'])) == \
+        [(a, b, both) for a, b, both, _ in expected]
+    np.testing.assert_allclose(result[metric].to_numpy(dtype=float), [score for *_, score in expected],
+                               rtol=1e-12, equal_nan=True)
+
+    # One skill gives the same rows as its part of the full result
+    if expected:
+        skill = expected[0][0]
+        one = processor.related_skills(skill, k=k, metric=metric, min_cooccurrence=min_cooccurrence)
+        assert list(one['related_skill']) == [b for a, b, _, _ in expected if a == skill]
+
+
+def test_tied_scores_rank_by_cooccurrence_then_name():
+    # Python has lift 1.0 with Go, SQL and Java; it co-occurs with Go and SQL twice and with Java once
+    df = pd.DataFrame({'skills': [
+        ['Python', 'SQL', 'Go'], ['Python', 'SQL', 'Go', 'Java'], ['AWS'], ['AWS', 'SQL', 'Go', 'Java'],
+    ]})
+    df = pd.concat([df, df], ignore_index=True)
+
+    related = JobDataProcessor(df).related_skills('Python', k=3, metric='lift')
+
+    assert list(related['related_skill']) == ['Go', 'SQL', 'Java']
+    assert list(related['cooccurrence']) == [4, 4, 2]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_correlation_matches_dataframe_corr(seed):
+    df = random_jobs(random.Random(seed))
+    dense = dense_skills(df)
+
+    result = JobDataProcessor(df).analyze_skill_relationships('correlation')
+
+    pd.testing.assert_frame_equal(result, dense.corr(), check_exact=False, rtol=1e-12)
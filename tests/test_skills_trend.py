@@ -0,0 +1,139 @@
+import math
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from data_processor import JobDataProcessor
+
+SKILLS = ['AWS', 'Docker', 'Go', 'Java', 'Python', 'React', 'SQL']
+TRIALS = 60
+
+
+def random_jobs(rng, n=None, tz=None):
+    n = n or rng.randrange(4, 80)
+    start = pd.Timestamp('2024-01-01', tz=tz)
+    # Whole days, so several postings share a date and some fall on the median
+    created_at = [start + pd.Timedelta(days=rng.randrange(0, 90)) for _ in range(n)]
+    return pd.DataFrame({
+        'skills': [rng.sample(SKILLS, rng.randrange(0, 4)) for _ in range(n)],
+        'created_at': pd.to_datetime(created_at)
+    })
+
+
+def reference_counts(periods):
+    counts = {}
+    for skills in periods['skills']:
+        for skill in skills:
+            counts[skill] = counts.get(skill, 0) + 1
+    return counts
+
+
+def reference_z_test(first_count, second_count, first_total, second_total):
+    pooled = (first_count + second_count) / (first_total + second_total)
+    std_err = math.sqrt(pooled * (1 - pooled) * (1 / first_total + 1 / second_total))
+    if std_err == 0:
+        return math.nan, math.nan
+    z = (second_count / second_total - first_count / first_total) / std_err
+    return z, 2 * stats.norm.sf(abs(z))
+
+
+def reference_skills_trend(df):
+    """
+    The original median split and per-skill loop, plus a two-proportion z-test per skill
+    """
+    midpoint = df['created_at'].median()
+    first = df[df['created_at'] < midpoint]
+    second = df[df['created_at'] >= midpoint]
+    first_counts, second_counts = reference_counts(first), reference_counts(second)
+
+    rows = []
+    for skill in set(first_counts) | set(second_counts):
+        first_count, second_count = first_counts.get(skill, 0), second_counts.get(skill, 0)
+        if first_count > 0:
+            growth_rate = (second_count - first_count) / first_count * 100
+        else:
+            growth_rate = 100 if second_count > 0 else 0
+        z, p = reference_z_test(first_count, second_count, len(first), len(second))
+        rows.append({'skill': skill, 'growth_rate': growth_rate, 'first_period_count': first_count,
+                     'second_period_count': second_count, 'z_score': z, 'p_value': p})
+    return pd.DataFrame(rows).sort_values('skill').reset_index(drop=True)
+
+
+def assert_trend_equal(trend, expected):
+    trend = trend.sort_values('skill').reset_index(drop=True)
+    assert list(trend['skill']) == list(expected['skill'])
+    for column in ['first_period_count', 'second_period_count']:
+        assert list(trend[column]) == list(expected[column])
+    for column in ['growth_rate', 'z_score', 'p_value']:
+        np.testing.assert_allclose(trend[column], expected[column], rtol=1e-9, equal_nan=True, err_msg=column)
+
+
+@pytest.mark.parametrize('seed', range(TRIALS))
+def test_skills_trend_matches_median_split(seed):
+    rng = random.Random(seed)
+    df = random_jobs(rng, tz=rng.choice([None, 'UTC']))
+
+    trend = JobDataProcessor(df).get_skills_trend()
+    expected = reference_skills_trend(df)
+
+    if expected.empty:
+        assert trend.empty or len(trend) == 0
+        return
+    assert_trend_equal(trend, expected)
+    assert list(trend['growth_rate']) == sorted(trend['growth_rate'], reverse=True)
+    np.testing.assert_array_equal(trend['significant'], trend['p_value'] < 0.05)
+
+
+def test_z_test_flags_a_real_shift():
+    # Python goes from 10% to 60% of 200 postings per half; SQL stays at 50%
+    first = [['Python', 'SQL'] if i < 10 else (['SQL'] if i < 50 else []) for i in range(100)]
+    second = [['Python', 'SQL'] if i < 50 else (['Python'] if i < 60 else []) for i in range(100)]
+    df = pd.DataFrame({
+        'skills': first + second,
+        'created_at': [pd.Timestamp('2024-01-01')] * 100 + [pd.Timestamp('2024-03-01')] * 100
+    })
+
+    trend = JobDataProcessor(df).get_skills_trend().set_index('skill')
+
+    assert trend.loc['Python', 'significant']
+    assert trend.loc['Python', 'z_score'] > 7
+    assert not trend.loc['SQL', 'significant']
+    assert trend.loc['SQL', 'z_score'] == pytest.approx(0)
+
+
+@pytest.mark.parametrize('freq', ['W', 'M'])
+@pytest.mark.parametrize('seed', range(10))
+def test_counts_by_calendar_period_match_groupby(seed, freq):
+    df = random_jobs(random.Random(seed), n=60)
+
+    counts, postings = JobDataProcessor(df).get_skill_counts_by_period(freq=freq)
+
+    period = df['created_at'].dt.to_period(freq)
+    all_periods = pd.period_range(period.min(), period.max(), freq=freq)
+    pairs = df.assign(period=period).explode('skills').dropna(subset=['skills'])
+    expected = (pairs.groupby(['period', 'skills']).size().unstack(fill_value=0)
+                .reindex(index=all_periods, columns=counts.columns, fill_value=0))
+    expected_postings = period.value_counts().reindex(all_periods, fill_value=0)
+
+    assert list(counts.index) == list(all_periods.to_timestamp())
+    np.testing.assert_array_equal(counts.to_numpy(), expected.to_numpy())
+    np.testing.assert_array_equal(postings.to_numpy(), expected_postings.to_numpy())
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_rolling_trend_sums_the_first_and_last_windows(seed):
+    df = random_jobs(random.Random(seed), n=80)
+    processor = JobDataProcessor(df)
+    counts, postings = processor.get_skill_counts_by_period(freq='W')
+
+    trend = processor.get_skills_trend(freq='W', rolling=3).set_index('skill')
+
+    first, second = counts.iloc[:3].sum(), counts.iloc[-3:].sum()
+    for skill, row in trend.iterrows():
+        assert row['first_period_count'] == first[skill]
+        assert row['second_period_count'] == second[skill]
+        z, _ = reference_z_test(first[skill], second[skill], postings.iloc[:3].sum(), postings.iloc[-3:].sum())
+        np.testing.assert_allclose(row['z_score'], z, rtol=1e-9, equal_nan=True)
@@ -0,0 +1,114 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processor import JobDataProcessor
+
+TRIALS = 80
+
+
+def random_jobs(rng, tz):
+    n = rng.randrange(0, 50)
+    start = pd.Timestamp('2024-03-01', tz=tz)
+    # Whole hours, so many postings sit exactly on a query boundary
+    created_at = [pd.NaT if rng.random() < 0.15 else start + pd.Timedelta(hours=rng.randrange(0, 24 * 10))
+                  for _ in range(n)]
+    dtype = f"datetime64[ns, {tz}]" if tz else 'datetime64[ns]'
+    df = pd.DataFrame({'created_at': pd.Series(created_at, dtype=dtype), 'title': [f"Job {i}" for i in range(n)]})
+    df.index = rng.sample(range(1000), n)
+    return df
+
+
+def random_bound(rng, tz):
+    if rng.random() < 0.2:
+        return None
+    value = pd.Timestamp('2024-02-28') + pd.Timedelta(hours=rng.randrange(0, 24 * 14))
+    kind = rng.choice(['naive', 'aware', 'string'])
+    if kind == 'string':
+        return str(value)
+    if kind == 'aware':
+        # The same wall time in the column's zone, or an instant given in another zone
+        if rng.random() < 0.5:
+            return value.tz_localize(tz or 'UTC', nonexistent='shift_forward', ambiguous=False)
+        return value.tz_localize('Asia/Tokyo')
+    return value
+
+
+def reference_between(df, start, end):
+    """
+    A boolean mask over created_at, then a stable sort by date
+    """
+    created_at = df['created_at']
+    mask = created_at.notna()
+    for bound, keep in [(start, lambda values, value: values >= value), (end, lambda values, value: values < value)]:
+        if bound is None:
+            continue
+        value = pd.Timestamp(bound)
+        if created_at.dt.tz is not None and value.tz is None:
+            value = value.tz_localize(created_at.dt.tz, nonexistent='shift_forward', ambiguous=False)
+        elif created_at.dt.tz is None and value.tz is not None:
+            value = value.tz_convert(None)
+        mask &= keep(created_at, value)
+    return df[mask].sort_values('created_at', kind='stable')
+
+
+@pytest.mark.parametrize('seed', range(TRIALS))
+def test_jobs_between_matches_a_mask(seed):
+    rng = random.Random(seed)
+    tz = rng.choice([None, 'UTC', 'US/Eastern'])
+    df = random_jobs(rng, tz)
+    processor = JobDataProcessor(df.copy())
+    if rng.random() < 0.5:
+        processor.sort_by_created_at()
+
+    for _ in range(5):
+        start, end = random_bound(rng, tz), random_bound(rng, tz)
+        result = processor.get_jobs_between(start, end)
+        expected = reference_between(df, start, end)
+
+        if df.empty:
+            assert result.empty
+            continue
+        assert list(result.index) == list(expected.index)
+        pd.testing.assert_series_equal(result['created_at'], expected['created_at'])
+
+
+def test_start_is_inclusive_and_end_exclusive():
+    df = pd.DataFrame({'created_at': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-02', '2024-01-03', None])})
+    processor = JobDataProcessor(df)
+
+    assert list(processor.get_jobs_between('2024-01-02', '2024-01-03').index) == [1, 2]
+    assert list(processor.get_jobs_between('2024-01-03', '2024-01-02').index) == []
+    # Postings without a date are never in range, even with no bounds
+    assert list(processor.get_jobs_between().index) == [0, 1, 2, 3]
+
+
+def test_sorted_frame_returns_a_slice():
+    df = pd.DataFrame({'created_at': pd.to_datetime(['2024-01-03', '2024-01-01', None, '2024-01-02'], utc=True)})
+    processor = JobDataProcessor(df)
+    processor.sort_by_created_at()
+
+    result = processor.get_jobs_between('2024-01-01', '2024-01-03')
+
+    assert list(result.index) == [1, 3]
+    assert np.shares_memory(result['created_at'].array.asi8, processor.df['created_at'].array.asi8)
+
+
+def test_naive_bounds_in_a_daylight_saving_gap():
+    df = pd.DataFrame({'created_at': pd.to_datetime(['2024-03-10 01:30', '2024-03-10 03:30', '2024-11-03 01:30'])
+                       .tz_localize('US/Eastern', ambiguous=True)})
+    processor = JobDataProcessor(df)
+
+    # 02:30 does not exist on 2024-03-10 and 01:00-02:00 happens twice on 2024-11-03
+    assert list(processor.get_jobs_between('2024-03-10 02:30', '2024-11-03 01:45').index) == [1, 2]
+
+
+def test_recent_jobs_with_utc_dates():
+    now = pd.Timestamp.now(tz='UTC')
+    df = pd.DataFrame({'created_at': [now - pd.Timedelta(days=10), now - pd.Timedelta(days=2), pd.NaT,
+                                      now - pd.Timedelta(hours=1)]})
+    df['created_at'] = pd.to_datetime(df['created_at'], utc=True)
+
+    assert sorted(JobDataProcessor(df).get_recent_jobs(days=7).index) == [1, 3]